@@ -4,7 +4,7 @@ Enhanced delete operations supporting soft and hard delete with cascading
 import os
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Callable, List, Optional
 from pathlib import Path
 
 from models.product import Product, Image, Size
@@ -300,13 +300,18 @@ def get_deleted_products(db: Session, skip: int = 0, limit: int = 100) -> List[P
         )
 
 
-def permanently_delete_old_soft_deleted(db: Session, days_old: int = 30) -> int:
+def permanently_delete_old_soft_deleted(
+        db: Session,
+        days_old: int = 30,
+        now: Optional[Callable[[], datetime]] = None
+) -> int:
     """
     Permanently delete products that have been soft deleted for more than specified days.
     
     Args:
         db: Database session
         days_old: Number of days after which to permanently delete soft-deleted items
+        now: Callable returning the current UTC time (defaults to datetime.now(timezone.utc))
         
     Returns:
         Number of products permanently deleted
@@ -317,7 +322,8 @@ def permanently_delete_old_soft_deleted(db: Session, days_old: int = 30) -> int:
     logger.info(f"Permanently deleting products soft-deleted more than {days_old} days ago")
 
     try:
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
+        current_time = now() if now else datetime.now(timezone.utc)
+        cutoff_date = current_time - timedelta(days=days_old)
 
         # Get products to be permanently deleted
         # Use <= for cutoff to include products deleted exactly at the cutoff time
@@ -0,0 +1,50 @@
+"""
+Shared pytest configuration for the backend test suite.
+
+pytest.ini runs the suite in parallel with pytest-xdist
+(``-n auto --dist=loadfile``), so every module stays on a single worker and
+its session-scoped fixtures are built only once. Pass ``-n 0`` to run
+serially, e.g. under a debugger.
+
+Modules that rely on session-scoped fixtures also mark themselves with
+``pytest.mark.xdist_group`` so that ``--dist=loadgroup`` keeps them together
+as well::
+
+    pytest tests/unit/api/routers/test_templates.py --dist=loadgroup
+
+While iterating on one module, rerun only what failed last time, or run
+the failures first and then the rest (the cache lives in ``.pytest_cache``)::
+
+    pytest --lf tests/unit/crud/test_delete_operations.py
+    pytest --ff tests/unit/crud/test_delete_operations.py
+
+Setting ``PROFILE=1`` profiles every test, fixture setup and teardown
+included, and writes one cProfile file per test into the pytest cache, next
+to the --lf data, so the profiles never land in the working tree::
+
+    PROFILE=1 pytest tests/unit/api/routers/test_templates.py
+    python -m pstats .pytest_cache/d/prof/<test id>.prof
+"""
+
+import cProfile
+import os
+import re
+
+import pytest
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Wrap the whole setup/call/teardown cycle in cProfile when PROFILE=1."""
+    if os.environ.get("PROFILE") != "1":
+        return (yield)
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return (yield)
+    finally:
+        profiler.disable()
+        profile_dir = item.config.cache.mkdir("prof")
+        file_name = re.sub(r"[^\w.-]+", "_", item.nodeid)
+        profiler.dump_stats(profile_dir / f"{file_name}.prof")
@@ -0,0 +1,49 @@
+"""
+Unit tests for the templates router pagination helper.
+
+calculate_pagination is pure arithmetic, so these tests need no
+TestClient, app or mocked database.
+"""
+
+import pytest
+
+from api.routers.templates import calculate_pagination
+
+
+class TestCalculatePagination:
+    """Test suite for calculate_pagination."""
+
+    @pytest.mark.parametrize("page,per_page,total,expected", [
+        # Basic pagination
+        (1, 10, 25, {"page": 1, "per_page": 10, "total": 25, "pages": 3, "has_next": True, "has_prev": False}),
+        # Last page
+        (3, 10, 25, {"has_next": False, "has_prev": True}),
+        # Exact division
+        (2, 10, 20, {"pages": 2, "has_next": False}),
+    ])
+    def test_calculate_pagination_helper(self, page, per_page, total, expected):
+        """Test calculate_pagination helper function."""
+        pagination = calculate_pagination(page=page, per_page=per_page, total=total)
+        
+        for field, value in expected.items():
+            assert getattr(pagination, field) == value
+
+    def test_calculate_pagination_zero_total(self):
+        """Test pagination with zero total items."""
+        pagination = calculate_pagination(page=1, per_page=10, total=0)
+        
+        assert pagination.page == 1
+        assert pagination.per_page == 10
+        assert pagination.total == 0
+        assert pagination.pages == 0
+        assert pagination.has_next is False
+        assert pagination.has_prev is False
+
+    def test_calculate_pagination_single_item(self):
+        """Test pagination with single item."""
+        pagination = calculate_pagination(page=1, per_page=10, total=1)
+        
+        assert pagination.page == 1
+        assert pagination.pages == 1
+        assert pagination.has_next is False
+        assert pagination.has_prev is False
@@ -6,85 +6,169 @@ creation, updates, deletion, restoration, preview, rendering, and validation.
 """
 
 import pytest
-from unittest.mock import Mock, patch
-from fastapi.testclient import TestClient
-from fastapi import FastAPI
+from unittest.mock import Mock, patch, DEFAULT
+from sqlalchemy.orm import Session
 
-from api.routers.templates import router
-from database.session import get_db
+from models.product import MessageTemplate as TemplateModel
 from exceptions.base import ValidationException
 
-
-@pytest.fixture
+# Keep the module on one xdist worker so the session-scoped client is reused
+pytestmark = pytest.mark.xdist_group("templates_router")
+
+_LIST_URL = "/api/v1/templates"
+_DETAIL_URL = _LIST_URL + "/{}"
+_RESTORE_URL = _DETAIL_URL + "/restore"
+_PREVIEW_URL = _LIST_URL + "/preview"
+_RENDER_URL = _LIST_URL + "/render"
+_VALIDATE_URL = _LIST_URL + "/validate"
+_PLACEHOLDERS_URL = _LIST_URL + "/placeholders/available"
+
+_CREATE_PAYLOAD = {
+    "name": "New Template",
+    "template_content": "Hello {product_name}",
+    "description": "A test template",
+    "is_active": True
+}
+_INVALID_PAYLOAD = {
+    "name": "Invalid Template",
+    "template_content": "Hello {invalid_placeholder}",
+    "description": "A test template",
+    "is_active": True
+}
+_UPDATE_PAYLOAD = {
+    "name": "Updated Template",
+    "template_content": "Updated {product_name}"
+}
+_PREVIEW_PAYLOAD = {
+    "template_content": "Hello {product_name}",
+    "product_id": 1
+}
+_INVALID_PREVIEW_PAYLOAD = {
+    "template_content": "Hello {invalid_placeholder}",
+    "product_id": 1
+}
+_RENDER_PAYLOAD = {
+    "template_id": 1,
+    "product_id": 1
+}
+
+
+# Full template records for endpoints that only pass the CRUD result through
+# MessageTemplate.model_validate; plain dicts skip attribute-mode validation.
+_TEMPLATE_ROW = {
+    "id": 1,
+    "name": "Test Template",
+    "description": "Test template",
+    "template_content": "Hello {product_name}",
+    "is_active": True,
+    "combine_images": False,
+    "optimize_images": True,
+    "max_file_size_kb": 500,
+    "max_width": 1920,
+    "max_height": 1080,
+    "compression_quality": 80,
+    "created_at": "2023-01-01T00:00:00",
+    "updated_at": "2023-01-01T00:00:00",
+    "deleted_at": None
+}
+
+
+def _template_row(**overrides):
+    """Build a template record dict with the given fields overridden."""
+    return {**_TEMPLATE_ROW, **overrides}
+
+
+def _template_mock(**overrides):
+    """Build a spec'd template model mock populated in one configure_mock call."""
+    mock = Mock(spec=TemplateModel)
+    mock.configure_mock(**_template_row(**overrides))
+    return mock
+
+
+@pytest.fixture(scope="session")
 def test_app():
     """Create test FastAPI app with templates router."""
+    from fastapi import FastAPI
+    from api.routers.templates import router
+
     app = FastAPI()
     app.include_router(router)
     return app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_db():
-    """Create mock database session."""
-    return Mock()
-
-
-@pytest.fixture
+    """Create mock database session shared by every test in the module."""
+    return Mock(spec=Session)
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_db(mock_db):
+    """Clear calls and configured results on the shared mock session."""
+    mock_db.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="class", autouse=True)
+def patched_router():
+    """Patch the router's CRUD and service dependencies once per test class."""
+    with patch.multiple(
+        'api.routers.templates',
+        get_templates=DEFAULT,
+        get_template_count=DEFAULT,
+        get_template_by_id=DEFAULT,
+        create_template=DEFAULT,
+        update_template=DEFAULT,
+        soft_delete_template=DEFAULT,
+        restore_template=DEFAULT,
+        validate_template_content=DEFAULT,
+        preview_template_with_product=DEFAULT,
+        render_template_with_product=DEFAULT,
+        get_template_placeholders=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_patched_router(patched_router):
+    """Reset the class-scoped router mocks after each test."""
+    yield
+    for mock in patched_router.values():
+        mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
 def test_client(test_app, mock_db):
-    """Create test client with mocked database dependency."""
-    def mock_get_db():
-        return mock_db
-    
-    test_app.dependency_overrides[get_db] = mock_get_db
-    client = TestClient(test_app)
-    yield client
+    """Create a test client shared by every test in the module."""
+    from fastapi.testclient import TestClient
+    from database.session import get_db
+
+    test_app.dependency_overrides[get_db] = lambda: mock_db
+    with TestClient(test_app) as client:
+        yield client
     test_app.dependency_overrides.clear()
 
 
 class TestTemplatesRouter:
     """Test suite for templates API router."""
 
-    @patch('api.routers.templates.get_templates')
-    @patch('api.routers.templates.get_template_count')
-    def test_list_templates_success(self, mock_count, mock_get_templates, test_client, mock_db):
+    def test_list_templates_success(self, test_client, mock_db, patched_router):
         """Test successful templates listing."""
-        mock_template1 = Mock()
-        mock_template1.id = 1
-        mock_template1.name = "Template 1"
-        mock_template1.description = "Test template 1"
-        mock_template1.template_content = "Hello {product_name}"
-        mock_template1.is_active = True
-        mock_template1.combine_images = False
-        mock_template1.optimize_images = True
-        mock_template1.max_file_size_kb = 500
-        mock_template1.max_width = 1920
-        mock_template1.max_height = 1080
-        mock_template1.compression_quality = 80
-        mock_template1.created_at = "2023-01-01T00:00:00"
-        mock_template1.updated_at = "2023-01-01T00:00:00"
-        mock_template1.deleted_at = None
-        
-        mock_template2 = Mock()
-        mock_template2.id = 2
-        mock_template2.name = "Template 2"
-        mock_template2.description = "Test template 2"
-        mock_template2.template_content = "Welcome {customer_name}"
-        mock_template2.is_active = True
-        mock_template2.combine_images = False
-        mock_template2.optimize_images = True
-        mock_template2.max_file_size_kb = 500
-        mock_template2.max_width = 1920
-        mock_template2.max_height = 1080
-        mock_template2.compression_quality = 80
-        mock_template2.created_at = "2023-01-01T00:00:00"
-        mock_template2.updated_at = "2023-01-01T00:00:00"
-        mock_template2.deleted_at = None
+        get_templates = patched_router["get_templates"]
+        get_template_count = patched_router["get_template_count"]
+        mock_template1 = _template_row(name="Template 1", description="Test template 1")
+        
+        mock_template2 = _template_row(
+            id=2,
+            name="Template 2",
+            description="Test template 2",
+            template_content="Welcome {customer_name}"
+        )
         
         mock_templates = [mock_template1, mock_template2]
-        mock_get_templates.return_value = mock_templates
-        mock_count.return_value = 2
+        get_templates.return_value = mock_templates
+        get_template_count.return_value = 2
         
-        response = test_client.get("/api/v1/templates")
+        response = test_client.get(_LIST_URL)
         
         assert response.status_code == 200
         data = response.json()
@@ -93,317 +177,211 @@ class TestTemplatesRouter:
         assert len(data["data"]) == 2
         assert data["pagination"]["total"] == 2
         
-        mock_get_templates.assert_called_once_with(
-            mock_db, skip=0, limit=20, include_deleted=False, active_only=False
-        )
-        mock_count.assert_called_once_with(mock_db, include_deleted=False, active_only=False)
+        assert get_templates.call_count == 1
+        assert get_templates.call_args.args == (mock_db,)
+        assert get_templates.call_args.kwargs == {
+            "skip": 0,
+            "limit": 20,
+            "include_deleted": False,
+            "active_only": False
+        }
+        assert get_template_count.call_count == 1
+        assert get_template_count.call_args.args == (mock_db,)
+        assert get_template_count.call_args.kwargs == {"include_deleted": False, "active_only": False}
 
-    @patch('api.routers.templates.get_templates')
-    @patch('api.routers.templates.get_template_count')
-    def test_list_templates_with_filters(self, mock_count, mock_get_templates, test_client, mock_db):
+    def test_list_templates_with_filters(self, test_client, mock_db, patched_router):
         """Test templates listing with filters."""
-        mock_template = Mock()
-        mock_template.id = 1
-        mock_template.name = "Active Template"
-        mock_template.description = "Active template"
-        mock_template.template_content = "Hello {product_name}"
-        mock_template.is_active = True
-        mock_template.combine_images = False
-        mock_template.optimize_images = True
-        mock_template.max_file_size_kb = 500
-        mock_template.max_width = 1920
-        mock_template.max_height = 1080
-        mock_template.compression_quality = 80
-        mock_template.created_at = "2023-01-01T00:00:00"
-        mock_template.updated_at = "2023-01-01T00:00:00"
-        mock_template.deleted_at = None
+        get_templates = patched_router["get_templates"]
+        get_template_count = patched_router["get_template_count"]
+        mock_template = _template_row(name="Active Template", description="Active template")
         
         mock_templates = [mock_template]
-        mock_get_templates.return_value = mock_templates
-        mock_count.return_value = 1
+        get_templates.return_value = mock_templates
+        get_template_count.return_value = 1
         
-        response = test_client.get("/api/v1/templates?page=2&per_page=5&active_only=true&include_deleted=true")
+        response = test_client.get(
+            _LIST_URL, params={"page": 2, "per_page": 5, "active_only": True, "include_deleted": True}
+        )
         
         assert response.status_code == 200
         data = response.json()
         assert data["pagination"]["page"] == 2
         assert data["pagination"]["per_page"] == 5
         
-        mock_get_templates.assert_called_once_with(
-            mock_db, skip=5, limit=5, include_deleted=True, active_only=True
-        )
+        assert get_templates.call_count == 1
+        assert get_templates.call_args.args == (mock_db,)
+        assert get_templates.call_args.kwargs == {"skip": 5, "limit": 5, "include_deleted": True, "active_only": True}
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_get_template_success(self, mock_get_template, test_client, mock_db):
+    def test_get_template_success(self, test_client, mock_db, patched_router):
         """Test successful template retrieval."""
-        mock_template = Mock()
-        mock_template.id = 1
-        mock_template.name = "Test Template"
-        mock_template.description = "Test template"
-        mock_template.template_content = "Hello {product_name}"
-        mock_template.is_active = True
-        mock_template.combine_images = False
-        mock_template.optimize_images = True
-        mock_template.max_file_size_kb = 500
-        mock_template.max_width = 1920
-        mock_template.max_height = 1080
-        mock_template.compression_quality = 80
-        mock_template.created_at = "2023-01-01T00:00:00"
-        mock_template.updated_at = "2023-01-01T00:00:00"
-        mock_template.deleted_at = None
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_template = _template_mock()
         mock_get_template.return_value = mock_template
         
-        response = test_client.get("/api/v1/templates/1")
+        response = test_client.get(_DETAIL_URL.format(1))
         
         assert response.status_code == 200
         data = response.json()
         assert "data" in data
         assert data["message"] == "Template retrieved successfully"
         
-        mock_get_template.assert_called_once_with(mock_db, template_id=1)
+        assert mock_get_template.call_count == 1
+        assert mock_get_template.call_args.args == (mock_db,)
+        assert mock_get_template.call_args.kwargs == {"template_id": 1}
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_get_template_not_found(self, mock_get_template, test_client):
-        """Test template retrieval when template not found."""
-        mock_get_template.return_value = None
-        
-        response = test_client.get("/api/v1/templates/999")
-        
-        assert response.status_code == 404
-        assert "Template not found" in response.json()["detail"]
-
-    @patch('api.routers.templates.validate_template_content')
-    @patch('api.routers.templates.create_template')
-    def test_create_template_success(self, mock_create, mock_validate, test_client, mock_db):
+    def test_create_template_success(self, test_client, mock_db, patched_router):
         """Test successful template creation."""
-        mock_validate.return_value = {"is_valid": True, "placeholders": []}
-        mock_template = Mock()
-        mock_template.id = 1
-        mock_template.name = "New Template"
-        mock_template.description = "A test template"
-        mock_template.template_content = "Hello {product_name}"
-        mock_template.is_active = True
-        mock_template.combine_images = False
-        mock_template.optimize_images = True
-        mock_template.max_file_size_kb = 500
-        mock_template.max_width = 1920
-        mock_template.max_height = 1080
-        mock_template.compression_quality = 80
-        mock_template.created_at = "2023-01-01T00:00:00"
-        mock_template.updated_at = "2023-01-01T00:00:00"
-        mock_template.deleted_at = None
-        mock_create.return_value = mock_template
-        
-        template_data = {
-            "name": "New Template",
-            "template_content": "Hello {product_name}",
-            "description": "A test template",
-            "is_active": True
-        }
+        validate_template_content = patched_router["validate_template_content"]
+        create_template = patched_router["create_template"]
+        validate_template_content.return_value = {"is_valid": True, "placeholders": []}
+        mock_template = _template_mock(name="New Template", description="A test template")
+        create_template.return_value = mock_template
         
-        response = test_client.post("/api/v1/templates", json=template_data)
+        response = test_client.post(_LIST_URL, json=_CREATE_PAYLOAD)
         
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Template created successfully"
         
-        mock_validate.assert_called_once_with("Hello {product_name}")
-        mock_create.assert_called_once()
+        assert validate_template_content.call_count == 1
+        assert validate_template_content.call_args.args == ("Hello {product_name}",)
+        assert validate_template_content.call_args.kwargs == {}
+        create_template.assert_called_once()
 
-    @patch('api.routers.templates.validate_template_content')
-    def test_create_template_invalid_content(self, mock_validate, test_client):
+    def test_create_template_invalid_content(self, test_client, patched_router):
         """Test template creation with invalid content."""
+        mock_validate = patched_router["validate_template_content"]
         mock_validate.return_value = {
             "is_valid": False, 
             "invalid_placeholders": ["{invalid_placeholder}"]
         }
         
-        template_data = {
-            "name": "Invalid Template",
-            "template_content": "Hello {invalid_placeholder}",
-            "description": "A test template",
-            "is_active": True
-        }
-        
-        response = test_client.post("/api/v1/templates", json=template_data)
+        response = test_client.post(_LIST_URL, json=_INVALID_PAYLOAD)
         
         assert response.status_code == 400
-        assert "invalid placeholders" in response.json()["detail"]
+        data = response.json()
+        assert "invalid placeholders" in data["detail"]
 
-    @patch('api.routers.templates.get_template_by_id')
-    @patch('api.routers.templates.validate_template_content')
-    @patch('api.routers.templates.update_template')
-    def test_update_template_success(self, mock_update, mock_validate, mock_get_template, test_client, mock_db):
+    def test_update_template_success(self, test_client, mock_db, patched_router):
         """Test successful template update."""
-        mock_existing = Mock()
-        mock_existing.id = 1
-        mock_existing.name = "Existing Template"
-        mock_get_template.return_value = mock_existing
-        mock_validate.return_value = {"is_valid": True, "placeholders": []}
-        
-        mock_updated = Mock()
-        mock_updated.id = 1
-        mock_updated.name = "Updated Template"
-        mock_updated.description = "Updated description"
-        mock_updated.template_content = "Updated {product_name}"
-        mock_updated.is_active = True
-        mock_updated.combine_images = False
-        mock_updated.optimize_images = True
-        mock_updated.max_file_size_kb = 500
-        mock_updated.max_width = 1920
-        mock_updated.max_height = 1080
-        mock_updated.compression_quality = 80
-        mock_updated.created_at = "2023-01-01T00:00:00"
-        mock_updated.updated_at = "2023-01-01T00:00:00"
-        mock_updated.deleted_at = None
-        mock_update.return_value = mock_updated
-        
-        update_data = {
-            "name": "Updated Template",
-            "template_content": "Updated {product_name}"
-        }
+        get_template_by_id = patched_router["get_template_by_id"]
+        validate_template_content = patched_router["validate_template_content"]
+        update_template = patched_router["update_template"]
+        mock_existing = _template_mock(name="Existing Template")
+        get_template_by_id.return_value = mock_existing
+        validate_template_content.return_value = {"is_valid": True, "placeholders": []}
+        
+        mock_updated = _template_row(
+            name="Updated Template",
+            description="Updated description",
+            template_content="Updated {product_name}"
+        )
+        update_template.return_value = mock_updated
         
-        response = test_client.put("/api/v1/templates/1", json=update_data)
+        response = test_client.put(_DETAIL_URL.format(1), json=_UPDATE_PAYLOAD)
         
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Template updated successfully"
         
-        mock_get_template.assert_called_once_with(mock_db, template_id=1)
-        mock_validate.assert_called_once_with("Updated {product_name}")
-        mock_update.assert_called_once()
+        assert get_template_by_id.call_count == 1
+        assert get_template_by_id.call_args.args == (mock_db,)
+        assert get_template_by_id.call_args.kwargs == {"template_id": 1}
+        assert validate_template_content.call_count == 1
+        assert validate_template_content.call_args.args == ("Updated {product_name}",)
+        assert validate_template_content.call_args.kwargs == {}
+        update_template.assert_called_once()
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_update_template_not_found(self, mock_get_template, test_client):
-        """Test template update when template not found."""
-        mock_get_template.return_value = None
-        
-        update_data = {"name": "Updated Template"}
-        
-        response = test_client.put("/api/v1/templates/999", json=update_data)
-        
-        assert response.status_code == 404
-        assert "Template not found" in response.json()["detail"]
-
-    @patch('api.routers.templates.get_template_by_id')
-    @patch('api.routers.templates.soft_delete_template')
-    def test_delete_template_success(self, mock_delete, mock_get_template, test_client, mock_db):
+    def test_delete_template_success(self, test_client, mock_db, patched_router):
         """Test successful template deletion."""
-        mock_template = Mock(id=1, name="Template to Delete")
-        mock_get_template.return_value = mock_template
-        mock_delete.return_value = True
+        get_template_by_id = patched_router["get_template_by_id"]
+        soft_delete_template = patched_router["soft_delete_template"]
+        mock_template = _template_mock(name="Template to Delete")
+        get_template_by_id.return_value = mock_template
+        soft_delete_template.return_value = True
         
-        response = test_client.delete("/api/v1/templates/1")
+        response = test_client.delete(_DETAIL_URL.format(1))
         
         assert response.status_code == 200
         data = response.json()
         assert data["deleted_id"] == 1
         assert data["message"] == "Template deleted successfully"
         
-        mock_delete.assert_called_once_with(db=mock_db, template_id=1)
-
-    @patch('api.routers.templates.get_template_by_id')
-    def test_delete_template_not_found(self, mock_get_template, test_client):
-        """Test template deletion when template not found."""
-        mock_get_template.return_value = None
-        
-        response = test_client.delete("/api/v1/templates/999")
-        
-        assert response.status_code == 404
-        assert "Template not found" in response.json()["detail"]
+        assert soft_delete_template.call_count == 1
+        assert soft_delete_template.call_args.args == ()
+        assert soft_delete_template.call_args.kwargs == {"db": mock_db, "template_id": 1}
 
-    @patch('api.routers.templates.get_template_by_id')
-    @patch('api.routers.templates.restore_template')
-    def test_restore_template_success(self, mock_restore, mock_get_template, test_client, mock_db):
+    def test_restore_template_success(self, test_client, mock_db, patched_router):
         """Test successful template restoration."""
-        mock_deleted_template = Mock()
-        mock_deleted_template.id = 1
-        mock_deleted_template.name = "Deleted Template"
-        mock_deleted_template.deleted_at = "2023-01-01"
-        
-        mock_restored_template = Mock()
-        mock_restored_template.id = 1
-        mock_restored_template.name = "Restored Template"
-        mock_restored_template.description = "Restored template"
-        mock_restored_template.template_content = "Hello {product_name}"
-        mock_restored_template.is_active = True
-        mock_restored_template.combine_images = False
-        mock_restored_template.optimize_images = True
-        mock_restored_template.max_file_size_kb = 500
-        mock_restored_template.max_width = 1920
-        mock_restored_template.max_height = 1080
-        mock_restored_template.compression_quality = 80
-        mock_restored_template.created_at = "2023-01-01T00:00:00"
-        mock_restored_template.updated_at = "2023-01-01T00:00:00"
-        mock_restored_template.deleted_at = None
+        get_template_by_id = patched_router["get_template_by_id"]
+        restore_template = patched_router["restore_template"]
+        mock_deleted_template = _template_mock(name="Deleted Template", deleted_at="2023-01-01")
+        
+        mock_restored_template = _template_row(name="Restored Template", description="Restored template")
         
         # Mock two calls to get_template_by_id: first with include_deleted, then after restore
-        mock_get_template.side_effect = [mock_deleted_template, mock_restored_template]
-        mock_restore.return_value = True
+        get_template_by_id.side_effect = [mock_deleted_template, mock_restored_template]
+        restore_template.return_value = True
         
-        response = test_client.post("/api/v1/templates/1/restore")
+        response = test_client.post(_RESTORE_URL.format(1))
         
         assert response.status_code == 200
         data = response.json()
         assert data["message"] == "Template restored successfully"
         
-        mock_restore.assert_called_once_with(db=mock_db, template_id=1)
+        assert restore_template.call_count == 1
+        assert restore_template.call_args.args == ()
+        assert restore_template.call_args.kwargs == {"db": mock_db, "template_id": 1}
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_restore_template_not_deleted(self, mock_get_template, test_client):
+    def test_restore_template_not_deleted(self, test_client, patched_router):
         """Test template restoration when template is not deleted."""
-        mock_template = Mock(id=1, name="Active Template", deleted_at=None)
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_template = _template_mock(name="Active Template")
         mock_get_template.return_value = mock_template
         
-        response = test_client.post("/api/v1/templates/1/restore")
+        response = test_client.post(_RESTORE_URL.format(1))
         
         assert response.status_code == 400
-        assert "not deleted and cannot be restored" in response.json()["detail"]
+        data = response.json()
+        assert "not deleted and cannot be restored" in data["detail"]
 
-    @patch('api.routers.templates.preview_template_with_product')
-    def test_preview_template_success(self, mock_preview, test_client, mock_db):
+    def test_preview_template_success(self, test_client, mock_db, patched_router):
         """Test successful template preview."""
+        mock_preview = patched_router["preview_template_with_product"]
         mock_preview.return_value = {
             "rendered_content": "Hello Product A",
             "available_placeholders": ["{product_name}", "{product_price}"]
         }
         
-        preview_data = {
-            "template_content": "Hello {product_name}",
-            "product_id": 1
-        }
-        
-        response = test_client.post("/api/v1/templates/preview", json=preview_data)
+        response = test_client.post(_PREVIEW_URL, json=_PREVIEW_PAYLOAD)
         
         assert response.status_code == 200
         data = response.json()
         assert data["rendered_content"] == "Hello Product A"
         assert "{product_name}" in data["available_placeholders"]
         
-        mock_preview.assert_called_once_with(
-            db=mock_db,
-            template_content="Hello {product_name}",
-            product_id=1
-        )
+        assert mock_preview.call_count == 1
+        assert mock_preview.call_args.args == ()
+        assert mock_preview.call_args.kwargs == {
+            "db": mock_db,
+            "template_content": "Hello {product_name}",
+            "product_id": 1
+        }
 
-    @patch('api.routers.templates.preview_template_with_product')
-    def test_preview_template_validation_error(self, mock_preview, test_client):
+    def test_preview_template_validation_error(self, test_client, patched_router):
         """Test template preview with validation error."""
+        mock_preview = patched_router["preview_template_with_product"]
         mock_preview.side_effect = ValidationException("Invalid template content")
         
-        preview_data = {
-            "template_content": "Hello {invalid_placeholder}",
-            "product_id": 1
-        }
-        
-        response = test_client.post("/api/v1/templates/preview", json=preview_data)
+        response = test_client.post(_PREVIEW_URL, json=_INVALID_PREVIEW_PAYLOAD)
         
         assert response.status_code == 400
-        assert "Invalid template content" in response.json()["detail"]
+        data = response.json()
+        assert "Invalid template content" in data["detail"]
 
-    @patch('api.routers.templates.render_template_with_product')
-    def test_render_template_success(self, mock_render, test_client, mock_db):
+    def test_render_template_success(self, test_client, mock_db, patched_router):
         """Test successful template rendering."""
+        mock_render = patched_router["render_template_with_product"]
         mock_render.return_value = {
             "template_name": "Welcome Template",
             "rendered_content": "Welcome to Product A",
@@ -411,12 +389,7 @@ class TestTemplatesRouter:
             "product_url": "https://example.com/product-a"
         }
         
-        render_data = {
-            "template_id": 1,
-            "product_id": 1
-        }
-        
-        response = test_client.post("/api/v1/templates/render", json=render_data)
+        response = test_client.post(_RENDER_URL, json=_RENDER_PAYLOAD)
         
         assert response.status_code == 200
         data = response.json()
@@ -424,15 +397,13 @@ class TestTemplatesRouter:
         assert data["rendered_content"] == "Welcome to Product A"
         assert data["product_name"] == "Product A"
         
-        mock_render.assert_called_once_with(
-            db=mock_db,
-            template_id=1,
-            product_id=1
-        )
+        assert mock_render.call_count == 1
+        assert mock_render.call_args.args == ()
+        assert mock_render.call_args.kwargs == {"db": mock_db, "template_id": 1, "product_id": 1}
 
-    @patch('api.routers.templates.get_template_placeholders')
-    def test_get_available_placeholders(self, mock_get_placeholders, test_client):
+    def test_get_available_placeholders(self, test_client, patched_router):
         """Test getting available template placeholders."""
+        mock_get_placeholders = patched_router["get_template_placeholders"]
         mock_placeholders = {
             "product_name": "Name of the product",
             "product_price": "Price of the product",
@@ -440,7 +411,7 @@ class TestTemplatesRouter:
         }
         mock_get_placeholders.return_value = mock_placeholders
         
-        response = test_client.get("/api/v1/templates/placeholders/available")
+        response = test_client.get(_PLACEHOLDERS_URL)
         
         assert response.status_code == 200
         data = response.json()
@@ -448,16 +419,16 @@ class TestTemplatesRouter:
         assert "product_name" in data["data"]["placeholders"]
         assert data["message"] == "Retrieved 3 available placeholders"
 
-    @patch('api.routers.templates.validate_template_content')
-    def test_validate_template_content(self, mock_validate, test_client):
+    def test_validate_template_content(self, test_client, patched_router):
         """Test template content validation."""
+        mock_validate = patched_router["validate_template_content"]
         mock_validate.return_value = {
             "is_valid": True,
             "placeholders": ["{product_name}"],
             "invalid_placeholders": []
         }
         
-        response = test_client.post("/api/v1/templates/validate?template_content=Hello {product_name}")
+        response = test_client.post(_VALIDATE_URL, params={"template_content": "Hello {product_name}"})
         
         assert response.status_code == 200
         data = response.json()
@@ -465,208 +436,155 @@ class TestTemplatesRouter:
         assert "{product_name}" in data["data"]["placeholders"]
         assert data["message"] == "Template validation completed"
         
-        mock_validate.assert_called_once_with("Hello {product_name}")
-
-    def test_calculate_pagination_helper(self, test_client):
-        """Test calculate_pagination helper function."""
-        from api.routers.templates import calculate_pagination
-        
-        # Test basic pagination
-        pagination = calculate_pagination(page=1, per_page=10, total=25)
-        assert pagination.page == 1
-        assert pagination.per_page == 10
-        assert pagination.total == 25
-        assert pagination.pages == 3
-        assert pagination.has_next is True
-        assert pagination.has_prev is False
-        
-        # Test last page
-        pagination = calculate_pagination(page=3, per_page=10, total=25)
-        assert pagination.has_next is False
-        assert pagination.has_prev is True
-        
-        # Test exact division
-        pagination = calculate_pagination(page=2, per_page=10, total=20)
-        assert pagination.pages == 2
-        assert pagination.has_next is False
+        assert mock_validate.call_count == 1
+        assert mock_validate.call_args.args == ("Hello {product_name}",)
+        assert mock_validate.call_args.kwargs == {}
 
 
 class TestTemplatesRouterErrorHandling:
     """Test error handling in templates router."""
 
-    def test_invalid_template_id_parameter(self, test_client):
-        """Test invalid template ID parameter."""
-        response = test_client.get("/api/v1/templates/invalid")
-        assert response.status_code == 422  # Validation error
-        
-        response = test_client.get("/api/v1/templates/0")
-        assert response.status_code == 422  # ID must be >= 1
-
-    def test_invalid_pagination_parameters(self, test_client):
-        """Test invalid pagination parameters."""
-        # Invalid page number
-        response = test_client.get("/api/v1/templates?page=0")
-        assert response.status_code == 422
-        
-        # Invalid per_page (too high)
-        response = test_client.get("/api/v1/templates?per_page=200")
-        assert response.status_code == 422
-
-    def test_invalid_request_body(self, test_client):
-        """Test invalid request body for POST endpoints."""
-        # Missing required fields
-        response = test_client.post("/api/v1/templates", json={})
-        assert response.status_code == 422
-        
-        # Invalid field types
-        response = test_client.post("/api/v1/templates", json={
+    @pytest.mark.parametrize("method,url,payload", [
+        ("GET", _DETAIL_URL.format("invalid"), None),  # Non-integer ID
+        ("GET", _DETAIL_URL.format(0), None),  # ID must be >= 1
+        ("GET", f"{_LIST_URL}?page=0", None),  # Invalid page number
+        ("GET", f"{_LIST_URL}?per_page=200", None),  # per_page too high
+        ("POST", _LIST_URL, {}),  # Missing required fields
+        ("POST", _LIST_URL, {
             "name": 123,  # Should be string
             "template_content": "Hello {product_name}",
             "is_active": "invalid"  # Should be boolean
-        })
+        }),
+    ])
+    def test_request_validation_errors(self, test_client, method, url, payload):
+        """Test invalid path, query and body parameters are rejected."""
+        response = test_client.request(method, url, json=payload)
         assert response.status_code == 422
 
-
-class TestTemplatesRouterEdgeCases:
-    """Test suite for edge cases and additional coverage."""
-
-    def test_calculate_pagination_zero_total(self):
-        """Test pagination with zero total items."""
-        from api.routers.templates import calculate_pagination
+    @pytest.mark.parametrize("method,url,payload", [
+        ("GET", _DETAIL_URL.format(999), None),
+        ("PUT", _DETAIL_URL.format(999), {"name": "Updated Template"}),
+        ("DELETE", _DETAIL_URL.format(999), None),
+    ])
+    def test_template_not_found(self, test_client, patched_router, method, url, payload):
+        """Test retrieval, update and deletion when template not found."""
+        patched_router["get_template_by_id"].return_value = None
         
-        pagination = calculate_pagination(page=1, per_page=10, total=0)
+        response = test_client.request(method, url, json=payload)
         
-        assert pagination.page == 1
-        assert pagination.per_page == 10
-        assert pagination.total == 0
-        assert pagination.pages == 0
-        assert pagination.has_next is False
-        assert pagination.has_prev is False
+        assert response.status_code == 404
+        data = response.json()
+        assert "Template not found" in data["detail"]
 
-    def test_calculate_pagination_single_item(self):
-        """Test pagination with single item."""
-        from api.routers.templates import calculate_pagination
-        
-        pagination = calculate_pagination(page=1, per_page=10, total=1)
-        
-        assert pagination.page == 1
-        assert pagination.pages == 1
-        assert pagination.has_next is False
-        assert pagination.has_prev is False
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_delete_template_failure(self, mock_get_template, test_client):
+class TestTemplatesRouterEdgeCases:
+    """Test suite for edge cases and additional coverage."""
+
+    def test_delete_template_failure(self, test_client, patched_router):
         """Test template deletion failure."""
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_delete = patched_router["soft_delete_template"]
         # Mock existing template
-        mock_template = Mock()
-        mock_template.id = 1
+        mock_template = Mock(spec=TemplateModel, id=1)
         mock_get_template.return_value = mock_template
+        mock_delete.return_value = False  # Deletion failed
+        
+        response = test_client.delete(_DETAIL_URL.format(1))
         
-        with patch('api.routers.templates.soft_delete_template') as mock_delete:
-            mock_delete.return_value = False  # Deletion failed
-            
-            response = test_client.delete("/api/v1/templates/1")
-            
-            assert response.status_code == 500
-            assert "Failed to delete template" in response.json()["detail"]
+        assert response.status_code == 500
+        data = response.json()
+        assert "Failed to delete template" in data["detail"]
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_restore_template_failure(self, mock_get_template, test_client):
+    def test_restore_template_failure(self, test_client, patched_router):
         """Test template restore failure."""
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_restore = patched_router["restore_template"]
         # Mock existing deleted template
-        mock_template = Mock()
-        mock_template.id = 1
-        mock_template.deleted_at = Mock()  # Template is deleted
+        mock_template = Mock(spec=TemplateModel, id=1, deleted_at=Mock())  # Template is deleted
         mock_get_template.return_value = mock_template
+        mock_restore.return_value = False  # Restore failed
+        
+        response = test_client.post(_RESTORE_URL.format(1))
         
-        with patch('api.routers.templates.restore_template') as mock_restore:
-            mock_restore.return_value = False  # Restore failed
-            
-            response = test_client.post("/api/v1/templates/1/restore")
-            
-            assert response.status_code == 500
-            assert "Failed to restore template" in response.json()["detail"]
+        assert response.status_code == 500
+        data = response.json()
+        assert "Failed to restore template" in data["detail"]
 
-    @patch('api.routers.templates.get_template_by_id')
-    def test_restore_template_not_found_after_restore(self, mock_get_template, test_client):
+    def test_restore_template_not_found_after_restore(self, test_client, patched_router):
         """Test template restore when template not found after restore."""
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_restore = patched_router["restore_template"]
         # Mock existing deleted template for first call
-        mock_template = Mock()
-        mock_template.id = 1
-        mock_template.deleted_at = Mock()
+        mock_template = Mock(spec=TemplateModel, id=1, deleted_at=Mock())
         
         # Mock get_template_by_id to return template first, then None
         mock_get_template.side_effect = [mock_template, None]
+        mock_restore.return_value = True  # Restore succeeds
         
-        with patch('api.routers.templates.restore_template') as mock_restore:
-            mock_restore.return_value = True  # Restore succeeds
-            
-            response = test_client.post("/api/v1/templates/1/restore")
-            
-            assert response.status_code == 404
-            assert "Template not found after restore" in response.json()["detail"]
+        response = test_client.post(_RESTORE_URL.format(1))
+        
+        assert response.status_code == 404
+        data = response.json()
+        assert "Template not found after restore" in data["detail"]
 
-    @patch('api.routers.templates.render_template_with_product')
-    def test_render_template_validation_error(self, mock_render, test_client):
+    def test_render_template_validation_error(self, test_client, patched_router):
         """Test template rendering with validation error."""
+        mock_render = patched_router["render_template_with_product"]
         mock_render.side_effect = ValidationException("Template not found")
         
-        response = test_client.post("/api/v1/templates/render", json={
+        response = test_client.post(_RENDER_URL, json={
             "template_id": 999,
             "product_id": 1
         })
         
         assert response.status_code == 400
-        assert "Template not found" in response.json()["detail"]
+        data = response.json()
+        assert "Template not found" in data["detail"]
 
-    @patch('api.routers.templates.update_template')
-    @patch('api.routers.templates.get_template_by_id')
-    def test_update_template_with_invalid_content(self, mock_get_template, mock_update, test_client):
+    def test_update_template_with_invalid_content(self, test_client, patched_router):
         """Test template update with invalid content validation."""
+        mock_get_template = patched_router["get_template_by_id"]
+        mock_validate = patched_router["validate_template_content"]
         # Mock existing template
-        mock_template = Mock()
-        mock_template.id = 1
+        mock_template = Mock(spec=TemplateModel, id=1)
         mock_get_template.return_value = mock_template
+        mock_validate.return_value = {"is_valid": False, "errors": ["Invalid placeholder"]}
+        
+        response = test_client.put(_DETAIL_URL.format(1), json={
+            "template_content": "Hello {invalid_placeholder}"
+        })
         
-        with patch('api.routers.templates.validate_template_content') as mock_validate:
-            mock_validate.return_value = {"is_valid": False, "errors": ["Invalid placeholder"]}
-            
-            response = test_client.put("/api/v1/templates/1", json={
-                "template_content": "Hello {invalid_placeholder}"
-            })
-            
-            assert response.status_code == 400
-            assert "Template contains invalid placeholders" in response.json()["detail"]
-
-    def test_list_templates_edge_case_pagination(self, test_client):
+        assert response.status_code == 400
+        data = response.json()
+        assert "Template contains invalid placeholders" in data["detail"]
+        patched_router["update_template"].assert_not_called()
+
+    def test_list_templates_edge_case_pagination(self, test_client, patched_router):
         """Test list templates with edge case pagination parameters."""
-        with patch('api.routers.templates.get_templates') as mock_get_templates:
-            with patch('api.routers.templates.get_template_count') as mock_count:
-                mock_get_templates.return_value = []
-                mock_count.return_value = 0
-                
-                # Test with page beyond available pages
-                response = test_client.get("/api/v1/templates?page=100&per_page=10")
-                
-                assert response.status_code == 200
-                data = response.json()
-                assert data["pagination"]["page"] == 100
-                assert data["pagination"]["total"] == 0
-                assert data["pagination"]["pages"] == 0
-                assert len(data["data"]) == 0
-
-    def test_validate_template_with_empty_content(self, test_client):
+        patched_router["get_templates"].return_value = []
+        patched_router["get_template_count"].return_value = 0
+        
+        # Test with page beyond available pages
+        response = test_client.get(_LIST_URL, params={"page": 100, "per_page": 10})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["pagination"]["page"] == 100
+        assert data["pagination"]["total"] == 0
+        assert data["pagination"]["pages"] == 0
+        assert len(data["data"]) == 0
+
+    def test_validate_template_with_empty_content(self, test_client, patched_router):
         """Test template validation with empty content."""
-        with patch('api.routers.templates.validate_template_content') as mock_validate:
-            mock_validate.return_value = {
-                "is_valid": True,
-                "placeholders": [],
-                "errors": []
-            }
-            
-            response = test_client.post("/api/v1/templates/validate?template_content=")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["data"]["is_valid"] is True
\ No newline at end of file
+        patched_router["validate_template_content"].return_value = {
+            "is_valid": True,
+            "placeholders": [],
+            "errors": []
+        }
+        
+        response = test_client.post(_VALIDATE_URL, params={"template_content": ""})
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["data"]["is_valid"] is True
@@ -0,0 +1,34 @@
+"""
+Shared fixtures for the CRUD unit tests.
+"""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+
+# Built once; a Mock specced from a plain list skips re-walking Session per test.
+_SESSION_SPEC = [name for name in dir(Session) if not name.startswith('_')]
+
+
+@pytest.fixture(scope="module")
+def mock_db():
+    """Session stub restricted to the public Session API, shared by the module."""
+    return Mock(spec_set=_SESSION_SPEC)
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_db(mock_db):
+    """Clear calls and configured results on the shared mock session."""
+    mock_db.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture
+def stub_chain(mock_db):
+    """Return a helper making ``db.query(...)`` followed by ``methods`` return ``result``."""
+    def stub(*methods, result):
+        node = mock_db.query
+        for method in methods:
+            node = getattr(node.return_value, method)
+        node.return_value = result
+    return stub
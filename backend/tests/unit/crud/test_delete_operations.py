@@ -7,10 +7,10 @@ get_deleted_products, and permanently_delete_old_soft_deleted.
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, call
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
-from sqlalchemy.orm import Session
 
 from crud.delete_operations import (
     soft_delete_product,
@@ -25,25 +25,84 @@ from enums.delete_mode import DeleteMode
 from exceptions.base import DatabaseException, ProductException
 
 
+# Attribute lists are computed once; building a Mock from a plain list skips
+# re-walking the mapped classes for every stub.
+_PRODUCT_SPEC = dir(Product)
+_IMAGE_SPEC = dir(Image)
+
+# Any non-None timestamp marks a product as soft deleted; no need to read the clock.
+_DELETED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+# Clock value injected into permanently_delete_old_soft_deleted.
+_FIXED_NOW = datetime(2023, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _product_mock():
+    return Mock(spec=_PRODUCT_SPEC)
+
+
+def _image_mock():
+    return Mock(spec=_IMAGE_SPEC)
+
+
+def _products_with_ids(product_ids):
+    """Product doubles that only carry an id; permanent deletion reads nothing else."""
+    return [SimpleNamespace(id=product_id) for product_id in product_ids]
+
+
+@pytest.fixture
+def mock_atomic(mocker):
+    """Patch atomic_transaction with a context manager that enters cleanly.
+
+    The MagicMock returned by mocker.patch already implements the context
+    manager protocol, and its __exit__ returns False so exceptions propagate.
+    """
+    return mocker.patch('crud.delete_operations.atomic_transaction')
+
+
+class _LogLevel:
+    """Stand-in for a logger method that only records the messages passed to it."""
+
+    def __init__(self):
+        self.messages = []
+
+    def __call__(self, message, *args, **kwargs):
+        self.messages.append(message)
+
+
+class _RecordingLogger:
+    """Plain-Python logger replacement for tests that only inspect messages."""
+
+    def __init__(self):
+        self.debug = _LogLevel()
+        self.info = _LogLevel()
+        self.warning = _LogLevel()
+        self.error = _LogLevel()
+
+
+@pytest.fixture
+def mock_logger(mocker):
+    """Patch the module logger with a MagicMock for call assertions."""
+    return mocker.patch('crud.delete_operations.logger')
+
+
+@pytest.fixture
+def recording_logger(mocker):
+    """Swap the module logger for a _RecordingLogger."""
+    return mocker.patch('crud.delete_operations.logger', _RecordingLogger())
+
+
+@pytest.mark.usefixtures("mock_atomic")
 class TestSoftDeleteProduct:
     """Test suite for soft_delete_product function."""
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_success(self, mock_atomic):
+    def test_soft_delete_product_success(self, mock_db, stub_chain):
         """Test successful product soft deletion."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
+        mock_product = _product_mock()
         mock_product.deleted_at = None
         
-        # Mock database query
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        
-        # Mock update operations
-        mock_db.query.return_value.filter.return_value.update.return_value = 2  # 2 images updated
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        # Mock product lookup and the images/sizes updates
+        stub_chain('filter', 'first', result=mock_product)
+        stub_chain('filter', 'update', result=2)
         
         result = soft_delete_product(mock_db, 123)
         
@@ -51,17 +110,11 @@ class TestSoftDeleteProduct:
         assert mock_product.deleted_at is not None
         mock_db.flush.assert_called_once()
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_not_found(self, mock_atomic):
+    def test_soft_delete_product_not_found(self, mock_db, stub_chain):
         """Test soft deletion when product not found."""
-        mock_db = Mock(spec=Session)
         
         # Mock product not found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        stub_chain('filter', 'first', result=None)
         
         with pytest.raises(ProductException) as exc_info:
             soft_delete_product(mock_db, 999)
@@ -69,31 +122,23 @@ class TestSoftDeleteProduct:
         assert "Product not found for soft deletion" in str(exc_info.value)
         assert exc_info.value.details["product_id"] == 999
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_already_deleted(self, mock_atomic):
+    def test_soft_delete_product_already_deleted(self, mock_db, stub_chain, mock_logger):
         """Test soft deletion when product already soft deleted."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.deleted_at = datetime.now(timezone.utc)
+        mock_product = _product_mock()
+        mock_product.deleted_at = _DELETED_AT
         
         # Mock database query
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
+        stub_chain('filter', 'first', result=mock_product)
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        result = soft_delete_product(mock_db, 123)
         
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = soft_delete_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.warning.assert_called()
-            assert "already soft deleted" in str(mock_logger.warning.call_args)
+        assert result is True
+        mock_logger.warning.assert_called_once_with(
+            f"Product 123 is already soft deleted at {mock_product.deleted_at}"
+        )
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_database_exception(self, mock_atomic):
+    def test_soft_delete_product_database_exception(self, mock_atomic, mock_db):
         """Test soft deletion with database exception."""
-        mock_db = Mock(spec=Session)
         
         # Mock atomic transaction to raise exception
         mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
@@ -105,11 +150,9 @@ class TestSoftDeleteProduct:
         assert exc_info.value.details["operation"] == "soft_delete_product"
         assert exc_info.value.details["product_id"] == 123
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_updates_related_data(self, mock_atomic):
+    def test_soft_delete_product_updates_related_data(self, mock_db, mock_logger):
         """Test that soft deletion updates related images and sizes."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
+        mock_product = _product_mock()
         mock_product.deleted_at = None
         
         # Mock product query
@@ -118,107 +161,70 @@ class TestSoftDeleteProduct:
         
         # Mock image query
         mock_image_query = Mock()
-        mock_image_query.filter.return_value.filter.return_value.update.return_value = 3
+        mock_image_query.filter.return_value.update.return_value = 3
         
         # Mock size query  
         mock_size_query = Mock()
-        mock_size_query.filter.return_value.filter.return_value.update.return_value = 2
+        mock_size_query.filter.return_value.update.return_value = 2
         
         # Configure query to return different mocks for different model types
-        query_calls = []
-        def query_side_effect(model):
-            query_calls.append(model)
-            if model == Product:
-                return mock_product_query
-            elif model == Image:
-                return mock_image_query
-            elif model == Size:
-                return mock_size_query
-            return Mock()
-        
-        mock_db.query.side_effect = query_side_effect
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = soft_delete_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            # Should log about images and sizes updated
-            log_calls = [str(call) for call in mock_logger.info.call_args_list]
-            success_log = [call for call in log_calls if "Successfully soft deleted" in call]
-            assert len(success_log) > 0
-            assert "3" in success_log[0]  # 3 images
-            assert "2" in success_log[0]  # 2 sizes
-
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_soft_delete_product_logging(self, mock_atomic):
-        """Test logging behavior in soft_delete_product."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.deleted_at = None
+        queries = {Product: mock_product_query, Image: mock_image_query, Size: mock_size_query}
+        mock_db.query.side_effect = queries.__getitem__
         
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.update.return_value = 0
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        result = soft_delete_product(mock_db, 123)
         
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = soft_delete_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            # Should log both start and success messages
-            assert mock_logger.info.call_count == 2
+        assert result is True
+        # Should log about images and sizes updated
+        mock_logger.info.assert_any_call("Successfully soft deleted product ID: 123 with 3 images and 2 sizes")
 
 
+
+@pytest.mark.usefixtures("mock_atomic")
 class TestHardDeleteProduct:
     """Test suite for hard_delete_product function."""
 
-    @patch('crud.delete_operations.atomic_transaction')
-    @patch('crud.delete_operations.IMAGE_DIR', './test_images')
-    def test_hard_delete_product_success(self, mock_atomic):
-        """Test successful product hard deletion."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        # Mock image with local file
-        mock_image = Mock(spec=Image)
-        mock_image.url = "test_image.jpg"
+    @pytest.fixture
+    def image_path(self, mocker):
+        """Patch the module's Path so every local image resolves to one stub."""
+        mock_path = mocker.patch('crud.delete_operations.Path')
+        return mock_path.return_value.__truediv__.return_value
+
+    @pytest.mark.parametrize("url,exists,unlink_error,unlinked,log_level,log_message", [
+        ("test_image.jpg", True, None, True, "debug", "Deleted image file: {path}"),
+        ("http://example.com/image.jpg", True, None, False, "debug", "Skipping external image URL: {url}"),
+        ("nonexistent.jpg", False, None, False, "debug", "Image file not found: {path}"),
+        ("error_image.jpg", True, OSError("Permission denied"), True, "warning",
+         "Failed to delete image file {path}: Permission denied"),
+    ], ids=["local_file", "external_url", "file_not_found", "file_deletion_error"])
+    def test_hard_delete_product_image_files(self, url, exists, unlink_error, unlinked, log_level, log_message,
+                                             image_path, mock_db, stub_chain, recording_logger, mocker):
+        """Test image file cleanup during hard deletion."""
+        mocker.patch('crud.delete_operations.IMAGE_DIR', './test_images')
+        mock_product = _product_mock()
+        mock_image = _image_mock()
+        mock_image.url = url
         
         # Mock database queries
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_image]
-        mock_db.query.return_value.filter.return_value.delete.return_value = 1
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.unlink') as mock_unlink:
-                result = hard_delete_product(mock_db, 123)
-                
-                assert result is True
-                mock_db.delete.assert_called_once_with(mock_product)
-                mock_unlink.assert_called_once()
-
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_hard_delete_product_not_found(self, mock_atomic):
+        stub_chain('filter', 'first', result=mock_product)
+        stub_chain('filter', 'all', result=[mock_image])
+        stub_chain('filter', 'delete', result=1)
+        
+        image_path.exists.return_value = exists
+        image_path.unlink.side_effect = unlink_error
+        
+        result = hard_delete_product(mock_db, 123)
+        
+        assert result is True
+        mock_db.delete.assert_called_once_with(mock_product)
+        assert image_path.unlink.called is unlinked
+        expected_message = log_message.format(path=image_path, url=url)
+        assert expected_message in getattr(recording_logger, log_level).messages
+
+    def test_hard_delete_product_not_found(self, mock_db, stub_chain):
         """Test hard deletion when product not found."""
-        mock_db = Mock(spec=Session)
         
         # Mock product not found
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        stub_chain('filter', 'first', result=None)
         
         with pytest.raises(ProductException) as exc_info:
             hard_delete_product(mock_db, 999)
@@ -226,97 +232,8 @@ class TestHardDeleteProduct:
         assert "Product not found for hard deletion" in str(exc_info.value)
         assert exc_info.value.details["product_id"] == 999
 
-    @patch('crud.delete_operations.atomic_transaction')
-    @patch('crud.delete_operations.IMAGE_DIR', './test_images')
-    def test_hard_delete_product_with_external_images(self, mock_atomic):
-        """Test hard deletion with external image URLs."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        # Mock image with external URL
-        mock_image = Mock(spec=Image)
-        mock_image.url = "http://example.com/image.jpg"
-        
-        # Mock database queries
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_image]
-        mock_db.query.return_value.filter.return_value.delete.return_value = 1
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = hard_delete_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.debug.assert_called()
-            # Should log about skipping external URL
-            assert any("Skipping external image URL" in str(call) for call in mock_logger.debug.call_args_list)
-
-    @patch('crud.delete_operations.atomic_transaction')
-    @patch('crud.delete_operations.IMAGE_DIR', './test_images')
-    def test_hard_delete_product_file_not_found(self, mock_atomic):
-        """Test hard deletion when image file doesn't exist."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        # Mock image with local file that doesn't exist
-        mock_image = Mock(spec=Image)
-        mock_image.url = "nonexistent.jpg"
-        
-        # Mock database queries
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_image]
-        mock_db.query.return_value.filter.return_value.delete.return_value = 1
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('pathlib.Path.exists', return_value=False):
-            with patch('crud.delete_operations.logger') as mock_logger:
-                result = hard_delete_product(mock_db, 123)
-                
-                assert result is True
-                mock_logger.debug.assert_called()
-                # Should log about file not found
-                assert any("Image file not found" in str(call) for call in mock_logger.debug.call_args_list)
-
-    @patch('crud.delete_operations.atomic_transaction')
-    @patch('crud.delete_operations.IMAGE_DIR', './test_images')
-    def test_hard_delete_product_file_deletion_error(self, mock_atomic):
-        """Test hard deletion when file deletion fails."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        # Mock image with local file
-        mock_image = Mock(spec=Image)
-        mock_image.url = "error_image.jpg"
-        
-        # Mock database queries
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_image]
-        mock_db.query.return_value.filter.return_value.delete.return_value = 1
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('pathlib.Path.exists', return_value=True):
-            with patch('pathlib.Path.unlink', side_effect=OSError("Permission denied")):
-                with patch('crud.delete_operations.logger') as mock_logger:
-                    result = hard_delete_product(mock_db, 123)
-                    
-                    assert result is True
-                    mock_logger.warning.assert_called()
-                    # Should log warning about file deletion failure
-                    assert "Failed to delete image file" in str(mock_logger.warning.call_args)
-
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_hard_delete_product_database_exception(self, mock_atomic):
+    def test_hard_delete_product_database_exception(self, mock_atomic, mock_db):
         """Test hard deletion with database exception."""
-        mock_db = Mock(spec=Session)
         
         # Mock atomic transaction to raise exception
         mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
@@ -328,36 +245,13 @@ class TestHardDeleteProduct:
         assert exc_info.value.details["operation"] == "hard_delete_product"
         assert exc_info.value.details["product_id"] == 123
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_hard_delete_product_logging(self, mock_atomic):
-        """Test logging behavior in hard_delete_product."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.all.return_value = []
-        mock_db.query.return_value.filter.return_value.delete.return_value = 0
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = hard_delete_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            # Should log both start and success messages
-            assert mock_logger.info.call_count == 2
-
 
 class TestDeleteProductWithMode:
     """Test suite for delete_product_with_mode function."""
 
-    @patch('crud.delete_operations.soft_delete_product')
-    def test_delete_product_with_mode_soft(self, mock_soft_delete):
+    def test_delete_product_with_mode_soft(self, mock_db, mocker):
         """Test delete with soft mode."""
-        mock_db = Mock(spec=Session)
+        mock_soft_delete = mocker.patch('crud.delete_operations.soft_delete_product')
         mock_soft_delete.return_value = True
         
         result = delete_product_with_mode(mock_db, 123, DeleteMode.SOFT)
@@ -365,10 +259,9 @@ class TestDeleteProductWithMode:
         assert result is True
         mock_soft_delete.assert_called_once_with(mock_db, 123)
 
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_delete_product_with_mode_hard(self, mock_hard_delete):
+    def test_delete_product_with_mode_hard(self, mock_db, mocker):
         """Test delete with hard mode."""
-        mock_db = Mock(spec=Session)
+        mock_hard_delete = mocker.patch('crud.delete_operations.hard_delete_product')
         mock_hard_delete.return_value = True
         
         result = delete_product_with_mode(mock_db, 123, DeleteMode.HARD)
@@ -376,50 +269,28 @@ class TestDeleteProductWithMode:
         assert result is True
         mock_hard_delete.assert_called_once_with(mock_db, 123)
 
-    def test_delete_product_with_mode_invalid(self):
+    def test_delete_product_with_mode_invalid(self, mock_db):
         """Test delete with invalid mode."""
-        mock_db = Mock(spec=Session)
         
         with pytest.raises(ValueError) as exc_info:
             delete_product_with_mode(mock_db, 123, "INVALID_MODE")
         
         assert "Invalid delete mode" in str(exc_info.value)
 
-    @patch('crud.delete_operations.soft_delete_product')
-    def test_delete_product_with_mode_logging(self, mock_soft_delete):
-        """Test logging behavior in delete_product_with_mode."""
-        mock_db = Mock(spec=Session)
-        mock_soft_delete.return_value = True
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = delete_product_with_mode(mock_db, 123, DeleteMode.SOFT)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            log_message = str(mock_logger.info.call_args)
-            assert "Deleting product 123" in log_message
-            assert "soft" in log_message
 
 
+@pytest.mark.usefixtures("mock_atomic")
 class TestRestoreProduct:
     """Test suite for restore_product function."""
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_success(self, mock_atomic):
+    def test_restore_product_success(self, mock_db, stub_chain):
         """Test successful product restoration."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.deleted_at = datetime.now(timezone.utc)
-        
-        # Mock database queries
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
+        mock_product = _product_mock()
+        mock_product.deleted_at = _DELETED_AT
         
-        # Mock update operations for images and sizes
-        mock_db.query.return_value.filter.return_value.filter.return_value.update.return_value = 2
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        # Mock product lookup and the images/sizes updates
+        stub_chain('filter', 'first', result=mock_product)
+        stub_chain('filter', 'update', result=2)
         
         result = restore_product(mock_db, 123)
         
@@ -427,17 +298,11 @@ class TestRestoreProduct:
         assert mock_product.deleted_at is None
         mock_db.flush.assert_called_once()
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_not_found(self, mock_atomic):
+    def test_restore_product_not_found(self, mock_db, stub_chain):
         """Test restoration when product not found."""
-        mock_db = Mock(spec=Session)
         
         # Mock product not found (both soft-deleted and regular queries)
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        stub_chain('filter', 'first', result=None)
         
         with pytest.raises(ProductException) as exc_info:
             restore_product(mock_db, 999)
@@ -445,11 +310,9 @@ class TestRestoreProduct:
         assert "Product not found for restoration" in str(exc_info.value)
         assert exc_info.value.details["product_id"] == 999
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_not_soft_deleted(self, mock_atomic):
+    def test_restore_product_not_soft_deleted(self, mock_db):
         """Test restoration when product is not soft deleted."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
+        mock_product = _product_mock()
         
         # Create separate mock queries
         mock_soft_deleted_query = Mock()
@@ -458,21 +321,8 @@ class TestRestoreProduct:
         mock_regular_query = Mock()
         mock_regular_query.filter.return_value.first.return_value = mock_product
         
-        # Configure query calls to return different mocks
-        call_count = 0
-        def query_side_effect(*args):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:  # First call - soft deleted query
-                return mock_soft_deleted_query
-            else:  # Second call - regular query
-                return mock_regular_query
-        
-        mock_db.query.side_effect = query_side_effect
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        # Soft-deleted lookup first, then the regular lookup
+        mock_db.query.side_effect = [mock_soft_deleted_query, mock_regular_query]
         
         with pytest.raises(ProductException) as exc_info:
             restore_product(mock_db, 123)
@@ -480,10 +330,8 @@ class TestRestoreProduct:
         assert "Product is not soft deleted and cannot be restored" in str(exc_info.value)
         assert exc_info.value.details["product_id"] == 123
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_database_exception(self, mock_atomic):
+    def test_restore_product_database_exception(self, mock_atomic, mock_db):
         """Test restoration with database exception."""
-        mock_db = Mock(spec=Session)
         
         # Mock atomic transaction to raise exception
         mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
@@ -495,12 +343,10 @@ class TestRestoreProduct:
         assert exc_info.value.details["operation"] == "restore_product"
         assert exc_info.value.details["product_id"] == 123
 
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_restores_related_data(self, mock_atomic):
+    def test_restore_product_restores_related_data(self, mock_db, mock_logger):
         """Test that restoration updates related images and sizes."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.deleted_at = datetime.now(timezone.utc)
+        mock_product = _product_mock()
+        mock_product.deleted_at = _DELETED_AT
         
         # Mock product query
         mock_product_query = Mock()
@@ -509,91 +355,44 @@ class TestRestoreProduct:
         # Mock image and size queries
         mock_image_query = Mock()
         mock_size_query = Mock()
-        mock_image_query.filter.return_value.filter.return_value.update.return_value = 3
-        mock_size_query.filter.return_value.filter.return_value.update.return_value = 2
-        
-        # Configure query to return different mocks for different calls
-        query_call_count = 0
-        def query_side_effect(*args):
-            nonlocal query_call_count
-            query_call_count += 1
-            if query_call_count == 1:  # First call for finding product
-                return mock_product_query
-            elif query_call_count == 2:  # Images update
-                return mock_image_query
-            elif query_call_count == 3:  # Sizes update
-                return mock_size_query
-            return Mock()
-        
-        mock_db.query.side_effect = query_side_effect
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = restore_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            # Should log about images and sizes restored
-            log_calls = [str(call) for call in mock_logger.info.call_args_list]
-            success_log = [call for call in log_calls if "Successfully restored" in call]
-            assert len(success_log) > 0
-            assert "3" in success_log[0]  # 3 images
-            assert "2" in success_log[0]  # 2 sizes
-
-    @patch('crud.delete_operations.atomic_transaction')
-    def test_restore_product_logging(self, mock_atomic):
-        """Test logging behavior in restore_product."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.deleted_at = datetime.now(timezone.utc)
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_product
-        mock_db.query.return_value.filter.return_value.filter.return_value.update.return_value = 0
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = restore_product(mock_db, 123)
-            
-            assert result is True
-            mock_logger.info.assert_called()
-            # Should log both start and success messages
-            assert mock_logger.info.call_count == 2
+        mock_image_query.filter.return_value.update.return_value = 3
+        mock_size_query.filter.return_value.update.return_value = 2
+        
+        # Product lookup, then the images update, then the sizes update
+        mock_db.query.side_effect = [mock_product_query, mock_image_query, mock_size_query]
+        
+        result = restore_product(mock_db, 123)
+        
+        assert result is True
+        # Should log about images and sizes restored
+        mock_logger.info.assert_any_call("Successfully restored product ID: 123 with 3 images and 2 sizes")
 
 
 class TestGetDeletedProducts:
     """Test suite for get_deleted_products function."""
 
-    def test_get_deleted_products_success(self):
+    def test_get_deleted_products_success(self, mock_db, stub_chain):
         """Test successful retrieval of deleted products."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product), Mock(spec=Product)]
+        mock_products = [_product_mock(), _product_mock()]
         
-        mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
+        stub_chain('filter', 'offset', 'limit', 'all', result=mock_products)
         
         result = get_deleted_products(mock_db, skip=10, limit=20)
         
         assert result == mock_products
         mock_db.query.assert_called_once_with(Product)
 
-    def test_get_deleted_products_empty_result(self):
+    def test_get_deleted_products_empty_result(self, mock_db, stub_chain):
         """Test retrieval when no deleted products exist."""
-        mock_db = Mock(spec=Session)
         
-        mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = []
+        stub_chain('filter', 'offset', 'limit', 'all', result=[])
         
         result = get_deleted_products(mock_db)
         
         assert result == []
 
-    def test_get_deleted_products_database_exception(self):
+    def test_get_deleted_products_database_exception(self, mock_db):
         """Test retrieval with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -602,92 +401,129 @@ class TestGetDeletedProducts:
         assert "Failed to retrieve deleted products list" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "get_deleted_products"
 
-    def test_get_deleted_products_logging(self):
-        """Test logging behavior in get_deleted_products."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product)]
-        
-        mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = get_deleted_products(mock_db, skip=5, limit=10)
-            
-            assert result == mock_products
-            mock_logger.debug.assert_called()
-            # Should log both fetch and result messages
-            assert mock_logger.debug.call_count == 2
 
+def _setup_soft_delete_logging(stub_chain, mocker):
+    mock_product = _product_mock()
+    mock_product.deleted_at = None
+    stub_chain('filter', 'first', result=mock_product)
+    stub_chain('filter', 'update', result=0)
+    return True
 
-class TestPermanentlyDeleteOldSoftDeleted:
-    """Test suite for permanently_delete_old_soft_deleted function."""
 
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_success(self, mock_hard_delete):
-        """Test successful permanent deletion of old soft-deleted products."""
-        mock_db = Mock(spec=Session)
-        
-        # Mock old soft-deleted products
-        mock_product1 = Mock(spec=Product)
-        mock_product1.id = 1
-        mock_product2 = Mock(spec=Product)
-        mock_product2.id = 2
-        
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product1, mock_product2]
-        mock_hard_delete.return_value = True
-        
-        result = permanently_delete_old_soft_deleted(mock_db, days_old=30)
-        
-        assert result == 2
-        assert mock_hard_delete.call_count == 2
-        mock_hard_delete.assert_any_call(mock_db, 1)
-        mock_hard_delete.assert_any_call(mock_db, 2)
+def _setup_hard_delete_logging(stub_chain, mocker):
+    stub_chain('filter', 'first', result=_product_mock())
+    stub_chain('filter', 'all', result=[])
+    stub_chain('filter', 'delete', result=0)
+    return True
 
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_empty_result(self, mock_hard_delete):
-        """Test permanent deletion when no old products exist."""
-        mock_db = Mock(spec=Session)
-        
-        mock_db.query.return_value.filter.return_value.all.return_value = []
-        
-        result = permanently_delete_old_soft_deleted(mock_db, days_old=30)
-        
-        assert result == 0
-        mock_hard_delete.assert_not_called()
 
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_partial_failure(self, mock_hard_delete):
-        """Test permanent deletion with some failures."""
-        mock_db = Mock(spec=Session)
+def _setup_restore_logging(stub_chain, mocker):
+    mock_product = _product_mock()
+    mock_product.deleted_at = _DELETED_AT
+    stub_chain('filter', 'first', result=mock_product)
+    stub_chain('filter', 'update', result=0)
+    return True
+
+
+def _setup_delete_with_mode_logging(stub_chain, mocker):
+    mocker.patch('crud.delete_operations.soft_delete_product', return_value=True)
+    return True
+
+
+def _setup_get_deleted_logging(stub_chain, mocker):
+    mock_products = [_product_mock()]
+    stub_chain('filter', 'offset', 'limit', 'all', result=mock_products)
+    return mock_products
+
+
+@pytest.mark.usefixtures("mock_atomic")
+class TestDeleteOperationsLogging:
+    """Test suite for logging across the delete operation functions."""
+
+    @pytest.mark.parametrize("target,args,setup,level,call_count,first_message", [
+        (soft_delete_product, (123,), _setup_soft_delete_logging,
+         "info", 2, "Soft deleting product with ID: 123"),
+        (hard_delete_product, (123,), _setup_hard_delete_logging,
+         "info", 2, "Hard deleting product with ID: 123"),
+        (restore_product, (123,), _setup_restore_logging,
+         "info", 2, "Restoring soft-deleted product with ID: 123"),
+        (delete_product_with_mode, (123, DeleteMode.SOFT), _setup_delete_with_mode_logging,
+         "info", 1, "Deleting product 123 with mode"),
+        (get_deleted_products, (5, 10), _setup_get_deleted_logging,
+         "debug", 2, "Fetching deleted products with skip=5, limit=10"),
+    ], ids=["soft_delete", "hard_delete", "restore", "delete_with_mode", "get_deleted"])
+    def test_logging(self, target, args, setup, level, call_count, first_message,
+                     mocker, recording_logger, mock_db, stub_chain):
+        """Test that each operation logs its start and outcome messages."""
+        expected = setup(stub_chain, mocker)
         
-        # Mock old soft-deleted products
-        mock_product1 = Mock(spec=Product)
-        mock_product1.id = 1
-        mock_product2 = Mock(spec=Product)
-        mock_product2.id = 2
-        mock_product3 = Mock(spec=Product)
-        mock_product3.id = 3
+        result = target(mock_db, *args)
         
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product1, mock_product2, mock_product3]
+        assert result == expected
+        messages = getattr(recording_logger, level).messages
+        assert len(messages) == call_count
+        assert first_message in messages[0]
+
+
+class _FakeSession:
+    """Session double for the single query(...).filter(...).all() lookup.
+
+    hard_delete_product is patched in these tests, so nothing else is ever
+    called on the session.
+    """
+
+    __slots__ = ("rows", "criteria")
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.criteria = ()
+
+    def query(self, *entities):
+        return self
+
+    def filter(self, *criteria):
+        self.criteria = criteria
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class TestPermanentlyDeleteOldSoftDeleted:
+    """Test suite for permanently_delete_old_soft_deleted function."""
+
+    @pytest.fixture(autouse=True)
+    def mock_hard_delete(self, mocker):
+        """Patch hard_delete_product to succeed for every product."""
+        return mocker.patch('crud.delete_operations.hard_delete_product', return_value=True)
+
+    @pytest.mark.parametrize("product_ids,failing_ids,expected", [
+        ([1, 2], set(), 2),
+        ([], set(), 0),
+        ([1, 2, 3], {2}, 2),
+    ], ids=["success", "empty_result", "partial_failure"])
+    def test_permanently_delete_old_soft_deleted(self, product_ids, failing_ids, expected,
+                                                 mock_hard_delete, recording_logger):
+        """Test permanent deletion counts only the products that were actually deleted."""
+        db = _FakeSession(_products_with_ids(product_ids))
         
-        # Mock hard delete to fail for second product
         def hard_delete_side_effect(db, product_id):
-            if product_id == 2:
+            if product_id in failing_ids:
                 raise Exception("Delete failed")
             return True
         
         mock_hard_delete.side_effect = hard_delete_side_effect
         
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = permanently_delete_old_soft_deleted(mock_db, days_old=30)
-            
-            assert result == 2  # Only 2 succeeded
-            assert mock_hard_delete.call_count == 3
-            mock_logger.error.assert_called()
-            assert "Failed to permanently delete product 2" in str(mock_logger.error.call_args)
+        result = permanently_delete_old_soft_deleted(db, days_old=30)
+        
+        assert result == expected
+        assert mock_hard_delete.call_args_list == [call(db, product_id) for product_id in product_ids]
+        assert recording_logger.error.messages == [
+            f"Failed to permanently delete product {product_id}: Delete failed" for product_id in sorted(failing_ids)
+        ]
 
-    def test_permanently_delete_old_soft_deleted_database_exception(self):
+    def test_permanently_delete_old_soft_deleted_database_exception(self, mock_db):
         """Test permanent deletion with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -697,64 +533,25 @@ class TestPermanentlyDeleteOldSoftDeleted:
         assert exc_info.value.details["operation"] == "permanently_delete_old_soft_deleted"
         assert exc_info.value.details["days_old"] == 30
 
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_cutoff_calculation(self, mock_hard_delete):
-        """Test that cutoff date is calculated correctly."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.id = 1
-        
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product]
-        mock_hard_delete.return_value = True
-        
-        # Mock datetime to control the "now" time
-        mock_now = datetime(2023, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
-        with patch('crud.delete_operations.datetime') as mock_datetime:
-            mock_datetime.now.return_value = mock_now
-            mock_datetime.side_effect = lambda *args, **kw: datetime(*args, **kw) if args else mock_now
-            
-            # Also need to patch timedelta import
-            with patch('crud.delete_operations.timedelta') as mock_timedelta:
-                mock_timedelta.side_effect = timedelta
-                
-                result = permanently_delete_old_soft_deleted(mock_db, days_old=7)
-                
-                # Verify the function was called and returned successfully
-                assert result == 1
-                mock_hard_delete.assert_called_once_with(mock_db, 1)
-                
-                # Verify datetime.now was called to calculate cutoff
-                mock_datetime.now.assert_called_once_with(timezone.utc)
-
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_logging(self, mock_hard_delete):
-        """Test logging behavior in permanently_delete_old_soft_deleted."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.id = 1
-        
-        mock_db.query.return_value.filter.return_value.all.return_value = [mock_product]
-        mock_hard_delete.return_value = True
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = permanently_delete_old_soft_deleted(mock_db, days_old=30)
-            
-            assert result == 1
-            mock_logger.info.assert_called()
-            # Should log both start and completion messages
-            assert mock_logger.info.call_count == 2
-            assert "Permanently deleting products soft-deleted more than 30 days ago" in str(mock_logger.info.call_args_list[0])
-            assert "Permanently deleted 1 old soft-deleted products" in str(mock_logger.info.call_args_list[1])
-
-    @patch('crud.delete_operations.hard_delete_product')
-    def test_permanently_delete_old_soft_deleted_custom_days(self, mock_hard_delete):
-        """Test permanent deletion with custom days parameter."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.return_value.filter.return_value.all.return_value = []
-        
-        with patch('crud.delete_operations.logger') as mock_logger:
-            result = permanently_delete_old_soft_deleted(mock_db, days_old=60)
-            
-            assert result == 0
-            mock_logger.info.assert_called()
-            assert "60 days ago" in str(mock_logger.info.call_args_list[0])
\ No newline at end of file
+    @pytest.mark.parametrize("days_old,product_ids,expected", [
+        (30, [1], 1),
+        (60, [], 0),
+        (7, [1], 1),
+    ], ids=["default_days", "custom_days", "one_week"])
+    def test_permanently_delete_old_soft_deleted_cutoff(self, days_old, product_ids, expected,
+                                                        mock_hard_delete, mock_logger):
+        """Test the cutoff date, deletions and log messages for a given age."""
+        db = _FakeSession(_products_with_ids(product_ids))
+        
+        result = permanently_delete_old_soft_deleted(db, days_old=days_old, now=lambda: _FIXED_NOW)
+        
+        assert result == expected
+        assert mock_hard_delete.call_args_list == [call(db, product_id) for product_id in product_ids]
+        # The second filter clause compares deleted_at with the cutoff
+        cutoff_clause = db.criteria[1]
+        assert cutoff_clause.right.value == _FIXED_NOW - timedelta(days=days_old)
+        # Should log exactly the start and completion messages
+        assert mock_logger.info.call_args_list == [
+            call(f"Permanently deleting products soft-deleted more than {days_old} days ago"),
+            call(f"Permanently deleted {expected} old soft-deleted products"),
+        ]
@@ -7,23 +7,18 @@ create_product, update_existing_product_with_changes, get_product_by_id,
 get_products, update_product, delete_product, and get_product_count.
 """
 
-import os
 import pytest
-from unittest.mock import Mock, patch, MagicMock, AsyncMock, call
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, sentinel
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError, OperationalError
 
 from crud.product import (
     get_product_by_url,
     get_product_by_sku,
     find_existing_product,
     compare_product_data,
-    create_product,
-    update_existing_product_with_changes,
     get_product_by_id,
     get_products,
-    update_product,
     delete_product,
     get_product_count,
     create_size_combinations_new,
@@ -32,549 +27,343 @@ from crud.product import (
     delete_product_image,
     get_products_not_posted_to_telegram
 )
-from models.product import Product, Image, Size
-from schemas.product import ProductCreate, ProductUpdate
-from exceptions.base import DatabaseException, ValidationException, ProductException
+from models.product import Product
+from exceptions.base import DatabaseException, ProductException
+
+
+# Value returned by the patched sqlalchemy.func.now(); no need to read the clock.
+_FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+_PRODUCT_URL = "http://example.com/product"
+_SKU = "SKU123"
+_IMAGE_URL1 = "http://example.com/image1.jpg"
+_IMAGE_URL2 = "http://example.com/image2.jpg"
+_IMAGE_URL3 = "http://example.com/image3.jpg"
+# filter_duplicate_images_by_hash only reads these dicts, so tests can share them.
+_SCRAPED_IMAGE1 = {"url": _IMAGE_URL1, "file_hash": "hash1"}
+_SCRAPED_IMAGE2 = {"url": _IMAGE_URL2, "file_hash": "hash2"}
+_SCRAPED_IMAGE3 = {"url": _IMAGE_URL3, "file_hash": "hash3"}
+
+_COMPARE_DEFAULTS = dict(
+    name="Test Product",
+    price=100.0,
+    currency="USD",
+    availability="in_stock",
+    color="red",
+    composition="cotton",
+    item="shirt",
+    store="Victoria's Secret",
+    comment="comment"
+)
+_COMPARE_CHANGED = dict(
+    name="New Product",
+    price=150.0,
+    currency="EUR",
+    availability="out_of_stock",
+    color="blue",
+    composition="polyester",
+    item="jacket",
+    store="Calvin Klein",
+    comment="new comment"
+)
+_DELETED_AT = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_IMAGE1 = SimpleNamespace(url=_IMAGE_URL1, file_hash="hash1", deleted_at=None)
+_IMAGE2 = SimpleNamespace(url=_IMAGE_URL2, file_hash="hash2", deleted_at=None)
+_DELETED_IMAGE = SimpleNamespace(url="http://example.com/deleted.jpg", file_hash="hash_deleted", deleted_at=_DELETED_AT)
+_NO_IMAGE_CHANGES = {'to_add': set(), 'to_remove': set(), 'existing': set(), 'existing_hashes': set()}
+_NO_SIZE_CHANGES = {'to_add': set(), 'to_remove': set(), 'existing': set()}
+
+
+def _image_stub(**overrides):
+    """Image double for delete_product_image, which reads url and sets deleted_at."""
+    return SimpleNamespace(**{
+        'id': 1,
+        'product_id': 123,
+        'url': "/static/images/test_image.jpg",
+        'deleted_at': None,
+        **overrides
+    })
+
+
+@pytest.fixture(scope="module", autouse=True)
+def mock_logger():
+    """Patch the module logger with a MagicMock once for the whole module."""
+    with patch('crud.product.logger') as logger:
+        yield logger
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _freeze_func_now():
+    """Make sqlalchemy.func.now(), used to stamp deleted_at, return _FIXED_NOW."""
+    with patch('sqlalchemy.func.now', return_value=_FIXED_NOW):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_mock_logger(mock_logger):
+    """Clear calls recorded on the shared logger mock."""
+    mock_logger.reset_mock()
 
 
 class TestGetProductByUrl:
     """Test suite for get_product_by_url function."""
 
-    def test_get_product_by_url_found(self):
+    def test_get_product_by_url_found(self, mock_db, stub_chain):
         """Test successful product retrieval by URL."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        mock_product.id = 1
+        mock_product = SimpleNamespace(id=1)
+        stub_chain('filter', 'filter', 'first', result=mock_product)
         
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
-        
-        result = get_product_by_url(mock_db, "http://example.com/product")
+        result = get_product_by_url(mock_db, _PRODUCT_URL)
         
         assert result == mock_product
         mock_db.query.assert_called_once_with(Product)
-        mock_query.filter.assert_called_once()
-        mock_filter.filter.assert_called_once()
+        mock_db.query.return_value.filter.assert_called_once()
+        mock_db.query.return_value.filter.return_value.filter.assert_called_once()
 
-    def test_get_product_by_url_not_found(self):
+    def test_get_product_by_url_not_found(self, mock_db, stub_chain):
         """Test product retrieval when URL not found."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = None
+        stub_chain('filter', 'filter', 'first', result=None)
         
         result = get_product_by_url(mock_db, "http://example.com/nonexistent")
         
         assert result is None
 
-    def test_get_product_by_url_include_deleted(self):
+    def test_get_product_by_url_include_deleted(self, mock_db, stub_chain):
         """Test product retrieval with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
+        mock_product = SimpleNamespace(id=1)
+        stub_chain('filter', 'first', result=mock_product)
         
-        result = get_product_by_url(mock_db, "http://example.com/product", include_deleted=True)
+        result = get_product_by_url(mock_db, _PRODUCT_URL, include_deleted=True)
         
         assert result == mock_product
         # Should not call filter twice when include_deleted=True
-        mock_query.filter.assert_called_once()
-        mock_filter.filter.assert_not_called()
+        mock_db.query.return_value.filter.assert_called_once()
+        mock_db.query.return_value.filter.return_value.filter.assert_not_called()
 
-    def test_get_product_by_url_logging(self):
+    def test_get_product_by_url_logging(self, mock_logger, mock_db, stub_chain):
         """Test logging behavior in get_product_by_url."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        mock_product.id = 123
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
-        
-        with patch('crud.product.logger') as mock_logger:
-            result = get_product_by_url(mock_db, "http://example.com/product")
-            
-            assert result == mock_product
-            mock_logger.debug.assert_called()
-            # Should log both search and found messages
-            assert mock_logger.debug.call_count == 2
+        mock_product = SimpleNamespace(id=123)
+        stub_chain('filter', 'filter', 'first', result=mock_product)
+        
+        result = get_product_by_url(mock_db, _PRODUCT_URL)
+        
+        assert result == mock_product
+        mock_logger.debug.assert_called()
+        # Should log both search and found messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestGetProductBySku:
     """Test suite for get_product_by_sku function."""
 
-    def test_get_product_by_sku_found(self):
+    def test_get_product_by_sku_found(self, mock_db, stub_chain):
         """Test successful product retrieval by SKU."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        mock_product.id = 1
+        mock_product = SimpleNamespace(id=1)
+        stub_chain('options', 'filter', 'filter', 'first', result=mock_product)
         
-        mock_db.query.return_value = mock_query
-        mock_query.options.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
-        
-        result = get_product_by_sku(mock_db, "SKU123")
+        result = get_product_by_sku(mock_db, _SKU)
         
         assert result == mock_product
         mock_db.query.assert_called_once_with(Product)
-        mock_query.options.assert_called_once()
-        mock_query.filter.assert_called_once()
+        mock_db.query.return_value.options.assert_called_once()
+        mock_db.query.return_value.options.return_value.filter.assert_called_once()
 
-    def test_get_product_by_sku_not_found(self):
+    def test_get_product_by_sku_not_found(self, mock_db, stub_chain):
         """Test product retrieval when SKU not found."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.options.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = None
+        stub_chain('options', 'filter', 'filter', 'first', result=None)
         
         result = get_product_by_sku(mock_db, "NONEXISTENT")
         
         assert result is None
 
-    def test_get_product_by_sku_include_deleted(self):
+    def test_get_product_by_sku_include_deleted(self, mock_db, stub_chain):
         """Test product retrieval by SKU with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        
-        mock_db.query.return_value = mock_query
-        mock_query.options.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
+        mock_product = SimpleNamespace(id=1)
+        stub_chain('options', 'filter', 'first', result=mock_product)
         
-        result = get_product_by_sku(mock_db, "SKU123", include_deleted=True)
+        result = get_product_by_sku(mock_db, _SKU, include_deleted=True)
         
         assert result == mock_product
         # Should not call filter twice when include_deleted=True
-        mock_query.filter.assert_called_once()
-        mock_filter.filter.assert_not_called()
+        mock_filtered = mock_db.query.return_value.options.return_value.filter
+        mock_filtered.assert_called_once()
+        mock_filtered.return_value.filter.assert_not_called()
 
-    def test_get_product_by_sku_with_relationships(self):
+    def test_get_product_by_sku_with_relationships(self, mock_db, stub_chain):
         """Test that get_product_by_sku loads relationships."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_product = Mock(spec=Product)
-        
-        mock_db.query.return_value = mock_query
-        mock_query.options.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_product
+        mock_product = SimpleNamespace(id=1)
+        stub_chain('options', 'filter', 'filter', 'first', result=mock_product)
         
-        result = get_product_by_sku(mock_db, "SKU123")
+        result = get_product_by_sku(mock_db, _SKU)
         
         assert result == mock_product
         # Verify relationships are loaded
-        mock_query.options.assert_called_once()
+        mock_db.query.return_value.options.assert_called_once()
 
 
 class TestFindExistingProduct:
     """Test suite for find_existing_product function."""
 
     @patch('crud.product.get_product_by_sku')
-    def test_find_existing_product_by_sku_found(self, mock_get_by_sku):
+    def test_find_existing_product_by_sku_found(self, mock_get_by_sku, mock_db):
         """Test finding existing product by SKU match."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_get_by_sku.return_value = mock_product
+        mock_get_by_sku.return_value = sentinel.product
         
-        result = find_existing_product(mock_db, "SKU123")
+        result = find_existing_product(mock_db, _SKU)
         
-        assert result['product'] == mock_product
+        assert result['product'] is sentinel.product
         assert result['match_type'] == 'sku'
-        mock_get_by_sku.assert_called_once_with(mock_db, "SKU123", False)
+        mock_get_by_sku.assert_called_once_with(mock_db, _SKU, False)
 
     @patch('crud.product.get_product_by_sku')
-    def test_find_existing_product_by_sku_not_found(self, mock_get_by_sku):
+    def test_find_existing_product_by_sku_not_found(self, mock_get_by_sku, mock_db):
         """Test finding existing product when SKU doesn't exist."""
-        mock_db = Mock(spec=Session)
         mock_get_by_sku.return_value = None
         
-        result = find_existing_product(mock_db, "SKU123")
+        result = find_existing_product(mock_db, _SKU)
         
         assert result['product'] is None
         assert result['match_type'] is None
-        mock_get_by_sku.assert_called_once_with(mock_db, "SKU123", False)
+        mock_get_by_sku.assert_called_once_with(mock_db, _SKU, False)
 
     @patch('crud.product.get_product_by_sku')
-    def test_find_existing_product_sku_only(self, mock_get_by_sku):
+    def test_find_existing_product_sku_only(self, mock_get_by_sku, mock_db):
         """Test finding existing product with SKU only (no URL)."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_get_by_sku.return_value = mock_product
+        mock_get_by_sku.return_value = sentinel.product
         
-        result = find_existing_product(mock_db, "SKU123")
+        result = find_existing_product(mock_db, _SKU)
         
-        assert result['product'] == mock_product
+        assert result['product'] is sentinel.product
         assert result['match_type'] == 'sku'
-        mock_get_by_sku.assert_called_once_with(mock_db, "SKU123", False)
+        mock_get_by_sku.assert_called_once_with(mock_db, _SKU, False)
 
     @patch('crud.product.get_product_by_sku')
-    def test_find_existing_product_include_deleted(self, mock_get_by_sku):
+    def test_find_existing_product_include_deleted(self, mock_get_by_sku, mock_db):
         """Test finding existing product including deleted ones."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_get_by_sku.return_value = mock_product
+        mock_get_by_sku.return_value = sentinel.product
         
-        result = find_existing_product(mock_db, "SKU123", include_deleted=True)
+        result = find_existing_product(mock_db, _SKU, include_deleted=True)
         
-        assert result['product'] == mock_product
+        assert result['product'] is sentinel.product
         assert result['match_type'] == 'sku'
-        mock_get_by_sku.assert_called_once_with(mock_db, "SKU123", True)
-
+        mock_get_by_sku.assert_called_once_with(mock_db, _SKU, True)
 
 
 class TestCompareProductData:
     """Test suite for compare_product_data function."""
 
-    def test_compare_product_data_no_changes(self):
-        """Test comparison when no changes detected."""
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "nice"
-        existing_product.images = []
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "nice"
-        new_data.all_image_urls = []
-        new_data.available_sizes = []
-        
-        result = compare_product_data(existing_product, new_data)
-        
-        assert result['has_changes'] is False
-        assert result['field_changes'] == {}
-        assert not result['image_changes']['to_add']
-        assert not result['image_changes']['to_remove']
-        assert not result['size_changes']['to_add']
-        assert not result['size_changes']['to_remove']
-
-    def test_compare_product_data_field_changes(self):
-        """Test comparison when basic fields have changed."""
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Old Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "old comment"
-        existing_product.images = []
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "New Product"
-        new_data.price = 150.0
-        new_data.currency = "EUR"
-        new_data.availability = "out_of_stock"
-        new_data.color = "blue"
-        new_data.composition = "polyester"
-        new_data.item = "jacket"
-        new_data.store = "Calvin Klein"
-        new_data.comment = "new comment"
-        new_data.all_image_urls = []
-        new_data.available_sizes = []
-        
-        result = compare_product_data(existing_product, new_data)
-        
-        assert result['has_changes'] is True
-        assert len(result['field_changes']) == 9
-        assert result['field_changes']['name']['old'] == "Old Product"
-        assert result['field_changes']['name']['new'] == "New Product"
-        assert result['field_changes']['price']['old'] == 100.0
-        assert result['field_changes']['price']['new'] == 150.0
-
-    def test_compare_product_data_string_normalization(self):
-        """Test string normalization in field comparison."""
-        existing_product = Mock(spec=Product)
-        existing_product.name = "  Test Product  "
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = []
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = []
-        new_data.available_sizes = []
-        
-        result = compare_product_data(existing_product, new_data)
-        
-        # Should not detect changes due to string normalization
-        assert result['has_changes'] is False
-        assert 'name' not in result['field_changes']
-
-    def test_compare_product_data_image_changes(self):
-        """Test comparison when images have changed."""
-        existing_image1 = Mock(spec=Image)
-        existing_image1.url = "http://example.com/image1.jpg"
-        existing_image1.file_hash = "hash1"
-        existing_image1.deleted_at = None
-        
-        existing_image2 = Mock(spec=Image)
-        existing_image2.url = "http://example.com/image2.jpg"
-        existing_image2.file_hash = "hash2"
-        existing_image2.deleted_at = None
-        
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = [existing_image1, existing_image2]
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = ["http://example.com/image2.jpg", "http://example.com/image3.jpg"]
-        new_data.available_sizes = []
-        
-        result = compare_product_data(existing_product, new_data)
-        
-        assert result['has_changes'] is True
-        assert "http://example.com/image3.jpg" in result['image_changes']['to_add']
-        assert "http://example.com/image1.jpg" in result['image_changes']['to_remove']
-        assert "http://example.com/image2.jpg" in result['image_changes']['existing']
-
-    def test_compare_product_data_size_changes(self):
-        """Test comparison when sizes have changed."""
-        existing_size1 = Mock(spec=Size)
-        existing_size1.size_value = "S"
-        existing_size1.deleted_at = None
-        
-        existing_size2 = Mock(spec=Size)
-        existing_size2.size_value = "M"
-        existing_size2.deleted_at = None
-        
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = []
-        existing_product.sizes = [existing_size1, existing_size2]
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = []
-        new_data.available_sizes = ["M", "L", "XL"]
-        
-        result = compare_product_data(existing_product, new_data)
-        
-        assert result['has_changes'] is True
-        assert "L" in result['size_changes']['to_add']
-        assert "XL" in result['size_changes']['to_add']
-        assert "S" in result['size_changes']['to_remove']
-        assert "M" in result['size_changes']['existing']
-
-    def test_compare_product_data_ignore_deleted_images(self):
-        """Test that deleted images are ignored in comparison."""
-        existing_image1 = Mock(spec=Image)
-        existing_image1.url = "http://example.com/image1.jpg"
-        existing_image1.file_hash = "hash1"
-        existing_image1.deleted_at = None
-        
-        deleted_image = Mock(spec=Image)
-        deleted_image.url = "http://example.com/deleted.jpg"
-        deleted_image.file_hash = "hash_deleted"
-        deleted_image.deleted_at = datetime.now(timezone.utc)
-        
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = [existing_image1, deleted_image]
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = ["http://example.com/image1.jpg"]
-        new_data.available_sizes = []
+    @pytest.mark.parametrize(
+        "existing_overrides, new_overrides, expected_has_changes, "
+        "expected_field_changes, expected_image_changes, expected_size_changes",
+        [
+            ({}, {}, False, {}, _NO_IMAGE_CHANGES, _NO_SIZE_CHANGES),
+            (
+                {'name': "Old Product", 'comment': "old comment"},
+                _COMPARE_CHANGED,
+                True,
+                {
+                    'name': {'old': "Old Product", 'new': "New Product"},
+                    'price': {'old': 100.0, 'new': 150.0},
+                    'currency': {'old': "USD", 'new': "EUR"},
+                    'availability': {'old': "in_stock", 'new': "out_of_stock"},
+                    'color': {'old': "red", 'new': "blue"},
+                    'composition': {'old': "cotton", 'new': "polyester"},
+                    'item': {'old': "shirt", 'new': "jacket"},
+                    'store': {'old': "Victoria's Secret", 'new': "Calvin Klein"},
+                    'comment': {'old': "old comment", 'new': "new comment"}
+                },
+                _NO_IMAGE_CHANGES,
+                _NO_SIZE_CHANGES
+            ),
+            # Surrounding whitespace is ignored when comparing strings
+            ({'name': "  Test Product  "}, {}, False, {}, _NO_IMAGE_CHANGES, _NO_SIZE_CHANGES),
+            (
+                {'images': [_IMAGE1, _IMAGE2]},
+                {'all_image_urls': [_IMAGE_URL2, _IMAGE_URL3]},
+                True,
+                {},
+                {
+                    'to_add': {_IMAGE_URL3},
+                    'to_remove': {_IMAGE_URL1},
+                    'existing': {_IMAGE_URL2},
+                    'existing_hashes': {"hash1", "hash2"}
+                },
+                _NO_SIZE_CHANGES
+            ),
+            (
+                {'sizes': [
+                    SimpleNamespace(size_value="S", deleted_at=None),
+                    SimpleNamespace(size_value="M", deleted_at=None)
+                ]},
+                {'available_sizes': ["M", "L", "XL"]},
+                True,
+                {},
+                _NO_IMAGE_CHANGES,
+                {'to_add': {"L", "XL"}, 'to_remove': {"S"}, 'existing': {"M"}}
+            ),
+            (
+                {'images': [_IMAGE1, _DELETED_IMAGE]},
+                {'all_image_urls': [_IMAGE_URL1]},
+                False,
+                {},
+                {
+                    'to_add': set(),
+                    'to_remove': set(),
+                    'existing': {_IMAGE_URL1},
+                    'existing_hashes': {"hash1"}
+                },
+                _NO_SIZE_CHANGES
+            ),
+            (
+                {'sizes': [
+                    SimpleNamespace(size_value="S", deleted_at=None),
+                    SimpleNamespace(size_value="DELETED", deleted_at=_DELETED_AT)
+                ]},
+                {'available_sizes': ["S"]},
+                False,
+                {},
+                _NO_IMAGE_CHANGES,
+                {'to_add': set(), 'to_remove': set(), 'existing': {"S"}}
+            ),
+        ],
+        ids=[
+            "no_changes",
+            "field_changes",
+            "string_normalization",
+            "image_changes",
+            "size_changes",
+            "ignore_deleted_images",
+            "ignore_deleted_sizes",
+        ]
+    )
+    def test_compare_product_data(self, existing_overrides, new_overrides, expected_has_changes,
+                                  expected_field_changes, expected_image_changes, expected_size_changes):
+        """Test field, image and size change detection."""
+        existing_product = SimpleNamespace(
+            **{'id': 1, 'images': [], 'sizes': [], **_COMPARE_DEFAULTS, **existing_overrides}
+        )
+        new_data = SimpleNamespace(
+            **{'all_image_urls': [], 'available_sizes': [], **_COMPARE_DEFAULTS, **new_overrides}
+        )
         
         result = compare_product_data(existing_product, new_data)
         
-        # Should not detect changes since deleted image is ignored
-        assert result['has_changes'] is False
-        assert not result['image_changes']['to_add']
-        assert not result['image_changes']['to_remove']
-        assert "hash_deleted" not in result['image_changes']['existing_hashes']
-
-    def test_compare_product_data_ignore_deleted_sizes(self):
-        """Test that deleted sizes are ignored in comparison."""
-        existing_size1 = Mock(spec=Size)
-        existing_size1.size_value = "S"
-        existing_size1.deleted_at = None
-        
-        deleted_size = Mock(spec=Size)
-        deleted_size.size_value = "DELETED"
-        deleted_size.deleted_at = datetime.now(timezone.utc)
-        
-        existing_product = Mock(spec=Product)
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = []
-        existing_product.sizes = [existing_size1, deleted_size]
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = []
-        new_data.available_sizes = ["S"]
+        assert result['has_changes'] is expected_has_changes
+        assert result['field_changes'] == expected_field_changes
+        assert result['image_changes'] == expected_image_changes
+        assert result['size_changes'] == expected_size_changes
+
+    def test_compare_product_data_logging(self, mock_logger):
+        """Test logging behavior in compare_product_data."""
+        existing_product = SimpleNamespace(id=123, images=[], sizes=[], **_COMPARE_DEFAULTS)
+        new_data = SimpleNamespace(all_image_urls=[], available_sizes=[], **_COMPARE_DEFAULTS)
         
         result = compare_product_data(existing_product, new_data)
         
-        # Should not detect changes since deleted size is ignored
         assert result['has_changes'] is False
-        assert not result['size_changes']['to_add']
-        assert not result['size_changes']['to_remove']
-
-    def test_compare_product_data_logging(self):
-        """Test logging behavior in compare_product_data."""
-        existing_product = Mock(spec=Product)
-        existing_product.id = 123
-        existing_product.name = "Test Product"
-        existing_product.price = 100.0
-        existing_product.currency = "USD"
-        existing_product.availability = "in_stock"
-        existing_product.color = "red"
-        existing_product.composition = "cotton"
-        existing_product.item = "shirt"
-        existing_product.store = "Victoria's Secret"
-        existing_product.comment = "comment"
-        existing_product.images = []
-        existing_product.sizes = []
-        
-        new_data = Mock(spec=ProductCreate)
-        new_data.name = "Test Product"
-        new_data.price = 100.0
-        new_data.currency = "USD"
-        new_data.availability = "in_stock"
-        new_data.color = "red"
-        new_data.composition = "cotton"
-        new_data.item = "shirt"
-        new_data.store = "Victoria's Secret"
-        new_data.comment = "comment"
-        new_data.all_image_urls = []
-        new_data.available_sizes = []
-        
-        with patch('crud.product.logger') as mock_logger:
-            result = compare_product_data(existing_product, new_data)
-            
-            assert result['has_changes'] is False
-            mock_logger.debug.assert_called()
-            # Should log both start and completion messages
-            assert mock_logger.debug.call_count == 2
+        mock_logger.debug.assert_called()
+        # Should log both start and completion messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestFilterDuplicateImagesByHash:
@@ -582,11 +371,7 @@ class TestFilterDuplicateImagesByHash:
 
     def test_filter_duplicate_images_by_hash_no_duplicates(self):
         """Test filtering when no duplicates exist."""
-        new_images = [
-            {"url": "http://example.com/image1.jpg", "file_hash": "hash1"},
-            {"url": "http://example.com/image2.jpg", "file_hash": "hash2"},
-            {"url": "http://example.com/image3.jpg", "file_hash": "hash3"}
-        ]
+        new_images = [_SCRAPED_IMAGE1, _SCRAPED_IMAGE2, _SCRAPED_IMAGE3]
         existing_hashes = {"hash4", "hash5"}
         
         result = filter_duplicate_images_by_hash(new_images, existing_hashes)
@@ -596,11 +381,7 @@ class TestFilterDuplicateImagesByHash:
 
     def test_filter_duplicate_images_by_hash_with_duplicates(self):
         """Test filtering when duplicates exist."""
-        new_images = [
-            {"url": "http://example.com/image1.jpg", "file_hash": "hash1"},
-            {"url": "http://example.com/image2.jpg", "file_hash": "hash2"},
-            {"url": "http://example.com/image3.jpg", "file_hash": "hash3"}
-        ]
+        new_images = [_SCRAPED_IMAGE1, _SCRAPED_IMAGE2, _SCRAPED_IMAGE3]
         existing_hashes = {"hash2", "hash4"}
         
         result = filter_duplicate_images_by_hash(new_images, existing_hashes)
@@ -612,9 +393,9 @@ class TestFilterDuplicateImagesByHash:
     def test_filter_duplicate_images_by_hash_no_hash(self):
         """Test filtering when some images have no hash."""
         new_images = [
-            {"url": "http://example.com/image1.jpg", "file_hash": "hash1"},
-            {"url": "http://example.com/image2.jpg"},  # No hash
-            {"url": "http://example.com/image3.jpg", "file_hash": None}  # None hash
+            _SCRAPED_IMAGE1,
+            {"url": _IMAGE_URL2},  # No hash
+            {"url": _IMAGE_URL3, "file_hash": None}  # None hash
         ]
         existing_hashes = {"hash1"}
         
@@ -622,8 +403,8 @@ class TestFilterDuplicateImagesByHash:
         
         assert len(result) == 2
         # Should include images without hash
-        assert any(img.get("url") == "http://example.com/image2.jpg" for img in result)
-        assert any(img.get("url") == "http://example.com/image3.jpg" for img in result)
+        assert any(img.get("url") == _IMAGE_URL2 for img in result)
+        assert any(img.get("url") == _IMAGE_URL3 for img in result)
 
     def test_filter_duplicate_images_by_hash_empty_inputs(self):
         """Test filtering with empty inputs."""
@@ -633,29 +414,24 @@ class TestFilterDuplicateImagesByHash:
         result = filter_duplicate_images_by_hash([], {"hash1"})
         assert result == []
 
-    def test_filter_duplicate_images_by_hash_logging(self):
+    def test_filter_duplicate_images_by_hash_logging(self, mock_logger):
         """Test logging behavior in filter_duplicate_images_by_hash."""
-        new_images = [
-            {"url": "http://example.com/image1.jpg", "file_hash": "hash1"},
-            {"url": "http://example.com/image2.jpg", "file_hash": "hash2"}
-        ]
+        new_images = [_SCRAPED_IMAGE1, _SCRAPED_IMAGE2]
         existing_hashes = {"hash1"}
         
-        with patch('crud.product.logger') as mock_logger:
-            result = filter_duplicate_images_by_hash(new_images, existing_hashes)
-            
-            assert len(result) == 1
-            mock_logger.debug.assert_called()
-            # Should log about skipping duplicate
-            assert "Skipping duplicate image" in str(mock_logger.debug.call_args)
+        result = filter_duplicate_images_by_hash(new_images, existing_hashes)
+        
+        assert len(result) == 1
+        mock_logger.debug.assert_called()
+        # Should log about skipping duplicate
+        assert "Skipping duplicate image" in mock_logger.debug.call_args.args[0]
 
 
 class TestCreateSizeCombinationsNew:
     """Test suite for create_size_combinations_new function."""
 
-    def test_create_size_combinations_new_success(self):
+    def test_create_size_combinations_new_success(self, mock_db):
         """Test successful size combinations creation."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         combinations_data = {
             "size1_type": "chest",
@@ -677,9 +453,8 @@ class TestCreateSizeCombinationsNew:
         assert added_size.size2_type == "length"
         assert added_size.combination_data == combinations_data["combinations"]
 
-    def test_create_size_combinations_new_no_combinations(self):
+    def test_create_size_combinations_new_no_combinations(self, mock_logger, mock_db):
         """Test size combinations creation with no combinations data."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         combinations_data = {
             "size1_type": "chest",
@@ -687,16 +462,14 @@ class TestCreateSizeCombinationsNew:
             "combinations": {}
         }
         
-        with patch('crud.product.logger') as mock_logger:
-            create_size_combinations_new(mock_db, product_id, combinations_data)
-            
-            mock_db.add.assert_not_called()
-            mock_logger.warning.assert_called()
-            assert "No combinations data found" in str(mock_logger.warning.call_args)
+        create_size_combinations_new(mock_db, product_id, combinations_data)
+        
+        mock_db.add.assert_not_called()
+        mock_logger.warning.assert_called()
+        assert "No combinations data found" in mock_logger.warning.call_args.args[0]
 
-    def test_create_size_combinations_new_defaults(self):
+    def test_create_size_combinations_new_defaults(self, mock_db):
         """Test size combinations creation with default values."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         combinations_data = {
             "combinations": {
@@ -711,9 +484,8 @@ class TestCreateSizeCombinationsNew:
         assert added_size.size1_type == "size1"  # Default value
         assert added_size.size2_type == "size2"  # Default value
 
-    def test_create_size_combinations_new_logging(self):
+    def test_create_size_combinations_new_logging(self, mock_logger, mock_db):
         """Test logging behavior in create_size_combinations_new."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         combinations_data = {
             "combinations": {
@@ -722,21 +494,19 @@ class TestCreateSizeCombinationsNew:
             }
         }
         
-        with patch('crud.product.logger') as mock_logger:
-            create_size_combinations_new(mock_db, product_id, combinations_data)
-            
-            mock_logger.debug.assert_called()
-            mock_logger.info.assert_called()
-            assert "Creating size combinations" in str(mock_logger.debug.call_args)
-            assert "Created size combination record" in str(mock_logger.info.call_args)
+        create_size_combinations_new(mock_db, product_id, combinations_data)
+        
+        mock_logger.debug.assert_called()
+        mock_logger.info.assert_called()
+        assert "Creating size combinations" in mock_logger.debug.call_args.args[0]
+        assert "Created size combination record" in mock_logger.info.call_args.args[0]
 
 
 class TestCreateSimpleSizes:
     """Test suite for create_simple_sizes function."""
 
-    def test_create_simple_sizes_success(self):
+    def test_create_simple_sizes_success(self, mock_db):
         """Test successful simple sizes creation."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         available_sizes = ["S", "M", "L", "XL"]
         
@@ -750,77 +520,56 @@ class TestCreateSimpleSizes:
             assert added_size.size_type == "simple"
             assert added_size.size_value == size_value
 
-    def test_create_simple_sizes_empty_list(self):
+    def test_create_simple_sizes_empty_list(self, mock_logger, mock_db):
         """Test simple sizes creation with empty list."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         available_sizes = []
         
-        with patch('crud.product.logger') as mock_logger:
-            create_simple_sizes(mock_db, product_id, available_sizes)
-            
-            mock_db.add.assert_not_called()
-            mock_logger.warning.assert_called()
-            assert "No available sizes found" in str(mock_logger.warning.call_args)
+        create_simple_sizes(mock_db, product_id, available_sizes)
+        
+        mock_db.add.assert_not_called()
+        mock_logger.warning.assert_called()
+        assert "No available sizes found" in mock_logger.warning.call_args.args[0]
 
-    def test_create_simple_sizes_logging(self):
+    def test_create_simple_sizes_logging(self, mock_logger, mock_db):
         """Test logging behavior in create_simple_sizes."""
-        mock_db = Mock(spec=Session)
         product_id = 123
         available_sizes = ["S", "M"]
         
-        with patch('crud.product.logger') as mock_logger:
-            create_simple_sizes(mock_db, product_id, available_sizes)
-            
-            mock_logger.debug.assert_called()
-            mock_logger.info.assert_called()
-            assert "Creating simple sizes" in str(mock_logger.debug.call_args)
-            assert "Created 2 simple size records" in str(mock_logger.info.call_args)
+        create_simple_sizes(mock_db, product_id, available_sizes)
+        
+        mock_logger.debug.assert_called()
+        mock_logger.info.assert_called()
+        assert "Creating simple sizes" in mock_logger.debug.call_args.args[0]
+        assert "Created 2 simple size records" in mock_logger.info.call_args.args[0]
 
 
 class TestGetProductById:
     """Test suite for get_product_by_id function."""
 
-    def test_get_product_by_id_found(self):
-        """Test successful product retrieval by ID."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.name = "Test Product"
-        
-        mock_db.query.return_value.options.return_value.filter.return_value.filter.return_value.first.return_value = mock_product
-        
-        result = get_product_by_id(mock_db, 123)
-        
-        assert result == mock_product
+    # Only the stubbed chain returns the product, so the identity check also
+    # fails if the query is built with a different sequence of calls.
+    @pytest.mark.parametrize(
+        "product_id, include_deleted, chain, found",
+        [
+            (123, False, ('options', 'filter', 'filter', 'first'), True),
+            (999, False, ('options', 'filter', 'filter', 'first'), False),
+            (123, True, ('options', 'filter', 'first'), True),
+        ],
+        ids=["found", "not_found", "include_deleted"]
+    )
+    def test_get_product_by_id(self, mock_db, stub_chain, product_id, include_deleted, chain, found):
+        """Test product retrieval by ID with and without soft-deleted rows."""
+        expected = sentinel.product if found else None
+        stub_chain(*chain, result=expected)
+        
+        result = get_product_by_id(mock_db, product_id, include_deleted=include_deleted)
+        
+        assert result is expected
         mock_db.query.assert_called_once_with(Product)
 
-    def test_get_product_by_id_not_found(self):
-        """Test product retrieval by ID when not found."""
-        mock_db = Mock(spec=Session)
-        
-        mock_db.query.return_value.options.return_value.filter.return_value.filter.return_value.first.return_value = None
-        
-        result = get_product_by_id(mock_db, 999)
-        
-        assert result is None
-
-    def test_get_product_by_id_include_deleted(self):
-        """Test product retrieval by ID with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        
-        mock_db.query.return_value.options.return_value.filter.return_value.first.return_value = mock_product
-        
-        result = get_product_by_id(mock_db, 123, include_deleted=True)
-        
-        assert result == mock_product
-        # Should not call filter twice when include_deleted=True
-        query_mock = mock_db.query.return_value.options.return_value.filter.return_value
-        query_mock.filter.assert_not_called()
-
-    def test_get_product_by_id_database_exception(self):
+    def test_get_product_by_id_database_exception(self, mock_db):
         """Test product retrieval by ID with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -830,67 +579,46 @@ class TestGetProductById:
         assert exc_info.value.details["operation"] == "get_product_by_id"
         assert exc_info.value.details["product_id"] == 123
 
-    def test_get_product_by_id_logging(self):
+    def test_get_product_by_id_logging(self, mock_logger, mock_db, stub_chain):
         """Test logging behavior in get_product_by_id."""
-        mock_db = Mock(spec=Session)
-        mock_product = Mock(spec=Product)
-        mock_product.name = "Test Product"
+        mock_product = SimpleNamespace(name="Test Product")
+        
+        stub_chain('options', 'filter', 'filter', 'first', result=mock_product)
         
-        mock_db.query.return_value.options.return_value.filter.return_value.filter.return_value.first.return_value = mock_product
+        result = get_product_by_id(mock_db, 123)
         
-        with patch('crud.product.logger') as mock_logger:
-            result = get_product_by_id(mock_db, 123)
-            
-            assert result == mock_product
-            mock_logger.debug.assert_called()
-            # Should log both search and found messages
-            assert mock_logger.debug.call_count == 2
+        assert result == mock_product
+        mock_logger.debug.assert_called()
+        # Should log both search and found messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestGetProducts:
     """Test suite for get_products function."""
 
-    def test_get_products_success(self):
-        """Test successful products retrieval."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product), Mock(spec=Product)]
-        
-        mock_db.query.return_value.filter.return_value.options.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
-        
-        result = get_products(mock_db, skip=10, limit=20)
-        
-        assert result == mock_products
+    @pytest.mark.parametrize(
+        "kwargs, chain",
+        [
+            ({'skip': 10, 'limit': 20}, ('filter', 'options', 'offset', 'limit', 'all')),
+            # No deleted_at filter
+            ({'include_deleted': True}, ('options', 'offset', 'limit', 'all')),
+            # No joinedload options
+            ({'load_relationships': False}, ('filter', 'offset', 'limit', 'all')),
+        ],
+        ids=["default", "include_deleted", "no_relationships"]
+    )
+    def test_get_products(self, mock_db, stub_chain, kwargs, chain):
+        """Test products retrieval for each combination of query flags."""
+        mock_products = [sentinel.product1, sentinel.product2]
+        stub_chain(*chain, result=mock_products)
+        
+        result = get_products(mock_db, **kwargs)
+        
+        assert result is mock_products
         mock_db.query.assert_called_once_with(Product)
 
-    def test_get_products_include_deleted(self):
-        """Test products retrieval with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product)]
-        
-        mock_db.query.return_value.options.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
-        
-        result = get_products(mock_db, include_deleted=True)
-        
-        assert result == mock_products
-        # Should not call filter when include_deleted=True
-        mock_db.query.return_value.filter.assert_not_called()
-
-    def test_get_products_no_relationships(self):
-        """Test products retrieval without loading relationships."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product)]
-        
-        mock_db.query.return_value.filter.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
-        
-        result = get_products(mock_db, load_relationships=False)
-        
-        assert result == mock_products
-        # Should not call options when load_relationships=False
-        mock_db.query.return_value.filter.return_value.options.assert_not_called()
-
-    def test_get_products_database_exception(self):
+    def test_get_products_database_exception(self, mock_db):
         """Test products retrieval with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -899,49 +627,43 @@ class TestGetProducts:
         assert "Failed to retrieve products list" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "get_products"
 
-    def test_get_products_logging(self):
+    def test_get_products_logging(self, mock_logger, mock_db, stub_chain):
         """Test logging behavior in get_products."""
-        mock_db = Mock(spec=Session)
-        mock_products = [Mock(spec=Product), Mock(spec=Product)]
+        mock_products = [sentinel.product1, sentinel.product2]
+        
+        stub_chain('filter', 'options', 'offset', 'limit', 'all', result=mock_products)
         
-        mock_db.query.return_value.filter.return_value.options.return_value.offset.return_value.limit.return_value.all.return_value = mock_products
+        result = get_products(mock_db, skip=5, limit=10)
         
-        with patch('crud.product.logger') as mock_logger:
-            result = get_products(mock_db, skip=5, limit=10)
-            
-            assert result == mock_products
-            mock_logger.debug.assert_called()
-            # Should log both fetch and result messages
-            assert mock_logger.debug.call_count == 2
+        assert result == mock_products
+        mock_logger.debug.assert_called()
+        # Should log both fetch and result messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestGetProductCount:
     """Test suite for get_product_count function."""
 
-    def test_get_product_count_success(self):
-        """Test successful product count retrieval."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.return_value.filter.return_value.count.return_value = 42
-        
-        result = get_product_count(mock_db)
-        
-        assert result == 42
+    @pytest.mark.parametrize(
+        "include_deleted, chain, count",
+        [
+            (False, ('filter', 'count'), 42),
+            # No deleted_at filter
+            (True, ('count',), 100),
+        ],
+        ids=["default", "include_deleted"]
+    )
+    def test_get_product_count(self, mock_db, stub_chain, include_deleted, chain, count):
+        """Test product count with and without soft-deleted rows."""
+        stub_chain(*chain, result=count)
+        
+        result = get_product_count(mock_db, include_deleted=include_deleted)
+        
+        assert result == count
         mock_db.query.assert_called_once_with(Product)
 
-    def test_get_product_count_include_deleted(self):
-        """Test product count with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.return_value.count.return_value = 100
-        
-        result = get_product_count(mock_db, include_deleted=True)
-        
-        assert result == 100
-        # Should not call filter when include_deleted=True
-        mock_db.query.return_value.filter.assert_not_called()
-
-    def test_get_product_count_database_exception(self):
+    def test_get_product_count_database_exception(self, mock_db):
         """Test product count with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -950,48 +672,37 @@ class TestGetProductCount:
         assert "Failed to get product count" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "get_product_count"
 
-    def test_get_product_count_logging(self):
+    def test_get_product_count_logging(self, mock_logger, mock_db, stub_chain):
         """Test logging behavior in get_product_count."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.return_value.filter.return_value.count.return_value = 25
+        stub_chain('filter', 'count', result=25)
+        
+        result = get_product_count(mock_db)
         
-        with patch('crud.product.logger') as mock_logger:
-            result = get_product_count(mock_db)
-            
-            assert result == 25
-            mock_logger.debug.assert_called()
-            assert "Total product count: 25" in str(mock_logger.debug.call_args)
+        assert result == 25
+        mock_logger.debug.assert_called()
+        assert "Total product count: 25" in mock_logger.debug.call_args.args[0]
 
 
 class TestDeleteProduct:
     """Test suite for delete_product function."""
 
-    @patch('crud.delete_operations.soft_delete_product')
-    def test_delete_product_success(self, mock_soft_delete):
-        """Test successful product deletion."""
-        mock_db = Mock(spec=Session)
-        mock_soft_delete.return_value = True
-        
-        result = delete_product(mock_db, 123)
-        
-        assert result is True
-        mock_soft_delete.assert_called_once_with(mock_db, 123)
+    @pytest.fixture
+    def mock_soft_delete(self, mocker):
+        """Patch the soft delete that delete_product delegates to."""
+        return mocker.patch('crud.delete_operations.soft_delete_product')
 
-    @patch('crud.delete_operations.soft_delete_product')
-    def test_delete_product_failure(self, mock_soft_delete):
-        """Test product deletion failure."""
-        mock_db = Mock(spec=Session)
-        mock_soft_delete.return_value = False
+    @pytest.mark.parametrize("outcome", [True, False], ids=["success", "failure"])
+    def test_delete_product(self, mock_db, mock_soft_delete, outcome):
+        """Test that delete_product returns the soft delete result."""
+        mock_soft_delete.return_value = outcome
         
         result = delete_product(mock_db, 123)
         
-        assert result is False
+        assert result is outcome
         mock_soft_delete.assert_called_once_with(mock_db, 123)
 
-    @patch('crud.delete_operations.soft_delete_product')
-    def test_delete_product_exception(self, mock_soft_delete):
+    def test_delete_product_exception(self, mock_db, mock_soft_delete):
         """Test product deletion with exception."""
-        mock_db = Mock(spec=Session)
         mock_soft_delete.side_effect = ProductException("Product not found")
         
         with pytest.raises(ProductException):
@@ -1003,33 +714,27 @@ class TestDeleteProduct:
 class TestDeleteProductImage:
     """Test suite for delete_product_image function."""
 
-    @patch('os.path.exists')
-    @patch('os.remove')
-    @patch.dict('os.environ', {'IMAGE_DIR': './test_images'})
-    def test_delete_product_image_success(self, mock_remove, mock_exists):
+    @pytest.fixture
+    def mock_exists(self, mocker):
+        """Patch os.path.exists so no real file system lookups happen."""
+        return mocker.patch('os.path.exists')
+
+    @pytest.fixture
+    def mock_remove(self, mocker):
+        """Patch os.remove so no real files are deleted."""
+        return mocker.patch('os.remove')
+
+    def test_delete_product_image_success(self, monkeypatch, mock_db, stub_chain, mock_exists, mock_remove):
         """Test successful deletion of product image."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_image = Mock(spec=Image)
-        mock_image.id = 1
-        mock_image.product_id = 123
-        mock_image.url = "/static/images/test_image.jpg"
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_image
+        monkeypatch.setenv('IMAGE_DIR', './test_images')
+        mock_image = _image_stub()
+        stub_chain('filter', 'first', result=mock_image)
         mock_exists.return_value = True
         
-        # Mock func.now()
-        with patch('sqlalchemy.func.now') as mock_now:
-            mock_now.return_value = datetime.now()
-            
-            result = delete_product_image(mock_db, 123, 1)
+        result = delete_product_image(mock_db, 123, 1)
         
         assert result == mock_image
-        assert mock_image.deleted_at is not None
+        assert mock_image.deleted_at == _FIXED_NOW
         mock_db.commit.assert_called_once()
         # Check that exists was called for our file - check for both directory and filename components
         # This works cross-platform regardless of path separator
@@ -1043,48 +748,26 @@ class TestDeleteProductImage:
         assert 'test_images' in remove_call_args and filename in remove_call_args, \
             f"Remove not called with expected path components. Called with: {remove_call_args}"
 
-    def test_delete_product_image_not_found(self):
+    def test_delete_product_image_not_found(self, mock_db, stub_chain):
         """Test deletion of non-existent image."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        
-        # Setup query chain to return None
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = None
+        stub_chain('filter', 'first', result=None)
         
         result = delete_product_image(mock_db, 123, 999)
         
         assert result is None
         mock_db.commit.assert_not_called()
 
-    @patch('os.path.exists')
-    @patch('os.remove')
-    @patch.dict('os.environ', {'IMAGE_DIR': './images'})
-    def test_delete_product_image_file_not_found(self, mock_remove, mock_exists):
+    def test_delete_product_image_file_not_found(self, monkeypatch, mock_db, stub_chain, mock_exists, mock_remove):
         """Test deletion when image file doesn't exist on disk."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_image = Mock(spec=Image)
-        mock_image.id = 1
-        mock_image.product_id = 123
-        mock_image.url = "/static/images/missing_image.jpg"
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_image
+        monkeypatch.setenv('IMAGE_DIR', './images')
+        mock_image = _image_stub(url="/static/images/missing_image.jpg")
+        stub_chain('filter', 'first', result=mock_image)
         mock_exists.return_value = False  # File doesn't exist
         
-        with patch('sqlalchemy.func.now') as mock_now:
-            mock_now.return_value = datetime.now()
-            
-            result = delete_product_image(mock_db, 123, 1)
+        result = delete_product_image(mock_db, 123, 1)
         
         assert result == mock_image
-        assert mock_image.deleted_at is not None
+        assert mock_image.deleted_at == _FIXED_NOW
         mock_db.commit.assert_called_once()
         # Check that exists was called for our file - check for both directory and filename components
         # This works cross-platform regardless of path separator
@@ -1094,50 +777,31 @@ class TestDeleteProductImage:
         assert path_found, f"Expected path with 'images' and '{filename}' not found in: {exists_calls}"
         mock_remove.assert_not_called()  # Should not try to remove non-existent file
 
-    def test_delete_product_image_no_url(self):
+    def test_delete_product_image_no_url(self, mock_db, stub_chain):
         """Test deletion when image has no URL."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_image = Mock(spec=Image)
-        mock_image.id = 1
-        mock_image.product_id = 123
-        mock_image.url = None  # No URL
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_image
-        
-        with patch('sqlalchemy.func.now') as mock_now:
-            mock_now.return_value = datetime.now()
-            
-            result = delete_product_image(mock_db, 123, 1)
+        mock_image = _image_stub(url=None)  # No URL
+        stub_chain('filter', 'first', result=mock_image)
+        
+        result = delete_product_image(mock_db, 123, 1)
         
         assert result == mock_image
-        assert mock_image.deleted_at is not None
+        assert mock_image.deleted_at == _FIXED_NOW
         mock_db.commit.assert_called_once()
         # Note: No file operations should be performed when URL is None
 
-    def test_delete_product_image_wrong_product(self):
+    def test_delete_product_image_wrong_product(self, mock_db, stub_chain):
         """Test deletion when image belongs to different product."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
         
-        # Setup query chain to return None (no match for product_id + image_id)
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = None
+        # No match for product_id + image_id
+        stub_chain('filter', 'first', result=None)
         
         result = delete_product_image(mock_db, 123, 1)  # Image 1 doesn't belong to product 123
         
         assert result is None
         mock_db.commit.assert_not_called()
 
-    def test_delete_product_image_database_exception(self):
+    def test_delete_product_image_database_exception(self, mock_db):
         """Test deletion with database exception."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -1146,153 +810,98 @@ class TestDeleteProductImage:
         assert "Failed to delete image 1 from product 123" in str(exc_info.value)
         mock_db.rollback.assert_called_once()
 
-    @patch('os.path.exists')
-    @patch('os.remove')
-    @patch.dict('os.environ', {'IMAGE_DIR': './images'})
-    def test_delete_product_image_file_removal_error(self, mock_remove, mock_exists):
+    def test_delete_product_image_file_removal_error(self, monkeypatch, mock_db, stub_chain, mock_exists, mock_remove):
         """Test deletion when file removal fails."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_image = Mock(spec=Image)
-        mock_image.id = 1
-        mock_image.product_id = 123
-        mock_image.url = "/static/images/test_image.jpg"
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.first.return_value = mock_image
+        monkeypatch.setenv('IMAGE_DIR', './images')
+        mock_image = _image_stub()
+        stub_chain('filter', 'first', result=mock_image)
         mock_exists.return_value = True
         mock_remove.side_effect = OSError("Permission denied")  # File removal fails
         
-        with patch('sqlalchemy.func.now') as mock_now:
-            mock_now.return_value = datetime.now()
-            
-            # Should fail and rollback if file removal fails
-            with pytest.raises(DatabaseException):
-                delete_product_image(mock_db, 123, 1)
-            
-            # Check that rollback was called
-            mock_db.rollback.assert_called_once()
+        # Should fail and rollback if file removal fails
+        with pytest.raises(DatabaseException):
+            delete_product_image(mock_db, 123, 1)
+        
+        # Check that rollback was called
+        mock_db.rollback.assert_called_once()
 
 
 class TestGetProductsNotPostedToTelegram:
     """Test suite for get_products_not_posted_to_telegram function."""
 
-    def test_get_products_not_posted_success(self):
+    def test_get_products_not_posted_success(self, mock_db):
         """Test successful retrieval of products not posted to Telegram."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        
-        # Mock products
-        mock_product1 = Mock(spec=Product)
-        mock_product1.id = 1
-        mock_product1.name = "Product 1"
-        mock_product1.telegram_posted_at = None
-        mock_product1.deleted_at = None
-        
-        mock_product2 = Mock(spec=Product)
-        mock_product2.id = 2
-        mock_product2.name = "Product 2"
-        mock_product2.telegram_posted_at = None
-        mock_product2.deleted_at = None
+        mock_product1 = SimpleNamespace(id=1, name="Product 1", telegram_posted_at=None, deleted_at=None)
+        mock_product2 = SimpleNamespace(id=2, name="Product 2", telegram_posted_at=None, deleted_at=None)
         
         expected_products = [mock_product1, mock_product2]
         
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.all.return_value = expected_products
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.filter.return_value.order_by.return_value.all.return_value':
+                expected_products
+        })
+        mock_filter = mock_db.query.return_value.filter.return_value
+        mock_order_by = mock_filter.filter.return_value.order_by
         
         result = get_products_not_posted_to_telegram(mock_db)
         
         # Verify the correct query was built
         mock_db.query.assert_called_once_with(Product)
         # Should filter by telegram_posted_at is null and deleted_at is null
-        assert mock_query.filter.call_count == 1
+        assert mock_db.query.return_value.filter.call_count == 1
         assert mock_filter.filter.call_count == 1
-        mock_filter.order_by.assert_called_once()
-        mock_order_by.all.assert_called_once()
+        mock_order_by.assert_called_once()
+        mock_order_by.return_value.all.assert_called_once()
         
         assert result == expected_products
         assert len(result) == 2
 
-    def test_get_products_not_posted_with_limit(self):
+    def test_get_products_not_posted_with_limit(self, mock_db):
         """Test retrieval with limit parameter."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        mock_limit = Mock()
-        
-        mock_product = Mock(spec=Product)
-        mock_product.id = 1
-        mock_product.telegram_posted_at = None
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.limit.return_value = mock_limit
-        mock_limit.all.return_value = [mock_product]
+        mock_product = SimpleNamespace(id=1, telegram_posted_at=None)
+        
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.filter.return_value.order_by.return_value'
+            '.limit.return_value.all.return_value': [mock_product]
+        })
+        mock_order_by = mock_db.query.return_value.filter.return_value.filter.return_value.order_by.return_value
         
         result = get_products_not_posted_to_telegram(mock_db, limit=5)
         
         # Verify limit was applied
         mock_order_by.limit.assert_called_once_with(5)
-        mock_limit.all.assert_called_once()
+        mock_order_by.limit.return_value.all.assert_called_once()
         assert len(result) == 1
 
-    def test_get_products_not_posted_include_deleted(self):
+    def test_get_products_not_posted_include_deleted(self, mock_db):
         """Test retrieval including deleted products."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        
-        # Setup query chain - when include_deleted=True, should not filter by deleted_at
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.all.return_value = []
+        # When include_deleted=True, should not filter by deleted_at
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.order_by.return_value.all.return_value': []
+        })
+        mock_query = mock_db.query.return_value
         
         result = get_products_not_posted_to_telegram(mock_db, include_deleted=True)
         
         # Should only filter by telegram_posted_at, not deleted_at
-        mock_db.query.assert_called_once_with(Product)
         mock_query.filter.assert_called_once()
         # Should not call filter twice (no deleted_at filter)
-        mock_filter.filter.assert_not_called()
-        mock_filter.order_by.assert_called_once()
+        mock_query.filter.return_value.filter.assert_not_called()
+        mock_query.filter.return_value.order_by.assert_called_once()
 
-    def test_get_products_not_posted_empty_result(self):
+    def test_get_products_not_posted_empty_result(self, mock_db):
         """Test when no unposted products exist."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        
-        # Setup query chain to return empty list
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.all.return_value = []
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.filter.return_value.order_by.return_value.all.return_value': []
+        })
         
         result = get_products_not_posted_to_telegram(mock_db)
         
         assert result == []
         assert len(result) == 0
 
-    def test_get_products_not_posted_database_error(self):
+    def test_get_products_not_posted_database_error(self, mock_db):
         """Test error handling when database query fails."""
-        mock_db = Mock(spec=Session)
         mock_db.query.side_effect = Exception("Database connection failed")
         
         with pytest.raises(DatabaseException) as exc_info:
@@ -1300,41 +909,27 @@ class TestGetProductsNotPostedToTelegram:
         
         assert "Failed to get products not posted to Telegram" in str(exc_info.value)
 
-    def test_get_products_not_posted_ordering(self):
+    def test_get_products_not_posted_ordering(self, mock_db):
         """Test that products are ordered by creation date ascending."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        
-        # Setup query chain
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.all.return_value = []
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.filter.return_value.order_by.return_value.all.return_value': []
+        })
         
         get_products_not_posted_to_telegram(mock_db)
         
         # Verify order_by was called (specific ordering is checked in integration tests)
-        mock_filter.order_by.assert_called_once()
+        mock_db.query.return_value.filter.return_value.filter.return_value.order_by.assert_called_once()
 
-    def test_get_products_not_posted_limit_zero(self):
+    def test_get_products_not_posted_limit_zero(self, mock_db):
         """Test with limit of 0 (should not apply limit since 0 is falsy)."""
-        mock_db = Mock(spec=Session)
-        mock_query = Mock()
-        mock_filter = Mock()
-        mock_order_by = Mock()
-        
-        # Setup query chain - no limit should be applied for limit=0
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filter
-        mock_filter.filter.return_value = mock_filter
-        mock_filter.order_by.return_value = mock_order_by
-        mock_order_by.all.return_value = []
+        # No limit should be applied for limit=0
+        mock_db.configure_mock(**{
+            'query.return_value.filter.return_value.filter.return_value.order_by.return_value.all.return_value': []
+        })
+        mock_order_by = mock_db.query.return_value.filter.return_value.filter.return_value.order_by.return_value
         
         result = get_products_not_posted_to_telegram(mock_db, limit=0)
         
         # Verify limit was NOT applied (since 0 is falsy)
         mock_order_by.limit.assert_not_called()
-        assert result == []
\ No newline at end of file
+        assert result == []
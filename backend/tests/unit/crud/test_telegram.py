@@ -9,9 +9,9 @@ get_telegram_stats).
 """
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import Mock, patch, sentinel
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from crud.telegram import (
@@ -20,8 +20,6 @@ from crud.telegram import (
     get_channels,
     create_channel,
     update_channel,
-    soft_delete_channel,
-    get_channel_count,
     get_post_by_id,
     get_posts,
     create_post,
@@ -29,284 +27,191 @@ from crud.telegram import (
     get_telegram_stats
 )
 from models.product import TelegramChannel, TelegramPost, Product, MessageTemplate
-from schemas.telegram import TelegramChannelCreate, TelegramChannelUpdate, TelegramPostCreate, PostStatus
+from schemas.telegram import TelegramChannelUpdate, PostStatus
 from exceptions.base import DatabaseException, ValidationException
 
 
-class TestGetChannelById:
-    """Test suite for get_channel_by_id function."""
+# Value returned by the patched datetime.now(); no need to read the clock.
+_FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
 
-    def test_get_channel_by_id_found(self):
-        """Test successful channel retrieval by ID."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.name = "Test Channel"
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_channel
-        
-        result = get_channel_by_id(mock_db, 123)
-        
-        assert result == mock_channel
-        mock_db.query.assert_called_once_with(TelegramChannel)
+def _unique_chat_id_error():
+    """Fresh IntegrityError for a duplicate chat_id; the CRUD code reads str(error.orig)."""
+    return IntegrityError(
+        "statement", "params", Exception("UNIQUE constraint failed: telegram_channels.chat_id")
+    )
 
-    def test_get_channel_by_id_not_found(self):
-        """Test channel retrieval when ID not found."""
-        mock_db = Mock(spec=Session)
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = None
-        
-        result = get_channel_by_id(mock_db, 999)
-        
-        assert result is None
 
-    def test_get_channel_by_id_include_deleted(self):
-        """Test channel retrieval with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_channel
-        
-        result = get_channel_by_id(mock_db, 123, include_deleted=True)
-        
-        assert result == mock_channel
-        # Should not call filter twice when include_deleted=True
-        query_mock = mock_db.query.return_value.filter.return_value
-        query_mock.filter.assert_not_called()
+def _channel_create_data(**overrides):
+    """TelegramChannelCreate stand-in carrying every field create_channel reads."""
+    return SimpleNamespace(**{
+        'name': "Test Channel",
+        'chat_id': "@testchannel",
+        'description': None,
+        'template_id': None,
+        'is_active': True,
+        'auto_post': False,
+        'send_photos': True,
+        'disable_web_page_preview': False,
+        'disable_notification': False,
+        **overrides
+    })
 
-    def test_get_channel_by_id_database_exception(self):
-        """Test channel retrieval with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.side_effect = Exception("Database error")
-        
-        with pytest.raises(DatabaseException) as exc_info:
-            get_channel_by_id(mock_db, 123)
-        
-        assert "Failed to retrieve telegram channel by ID" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_channel_by_id"
-        assert exc_info.value.details["channel_id"] == 123
 
-    def test_get_channel_by_id_logging(self):
-        """Test logging behavior in get_channel_by_id."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.name = "Test Channel"
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_channel
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            result = get_channel_by_id(mock_db, 123)
-            
-            assert result == mock_channel
-            mock_logger.debug.assert_called()
-            # Should log both search and found messages
-            assert mock_logger.debug.call_count == 2
+@pytest.fixture(scope="module", autouse=True)
+def mock_logger():
+    """Patch the module logger with a MagicMock once for the whole module."""
+    with patch('crud.telegram.logger') as logger:
+        yield logger
 
 
-class TestGetChannelByChatId:
-    """Test suite for get_channel_by_chat_id function."""
+@pytest.fixture
+def frozen_now(mocker):
+    """Make datetime.now() in crud.telegram, used for the timestamps, return _FIXED_NOW."""
+    mocker.patch('crud.telegram.datetime').now.return_value = _FIXED_NOW
+    return _FIXED_NOW
 
-    def test_get_channel_by_chat_id_found(self):
-        """Test successful channel retrieval by chat ID."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.name = "Test Channel"
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_channel
-        
-        result = get_channel_by_chat_id(mock_db, "@testchannel")
-        
-        assert result == mock_channel
-        mock_db.query.assert_called_once_with(TelegramChannel)
 
-    def test_get_channel_by_chat_id_not_found(self):
-        """Test channel retrieval when chat ID not found."""
-        mock_db = Mock(spec=Session)
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = None
-        
-        result = get_channel_by_chat_id(mock_db, "@nonexistent")
-        
-        assert result is None
+@pytest.fixture(autouse=True)
+def _reset_mock_logger(mock_logger):
+    """Clear calls recorded on the shared logger mock."""
+    mock_logger.reset_mock()
 
-    def test_get_channel_by_chat_id_include_deleted(self):
-        """Test channel retrieval by chat ID with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_channel
-        
-        result = get_channel_by_chat_id(mock_db, "@testchannel", include_deleted=True)
-        
-        assert result == mock_channel
 
-    def test_get_channel_by_chat_id_database_exception(self):
-        """Test channel retrieval by chat ID with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.side_effect = Exception("Database error")
-        
-        with pytest.raises(DatabaseException) as exc_info:
-            get_channel_by_chat_id(mock_db, "@testchannel")
-        
-        assert "Failed to retrieve telegram channel by chat_id" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_channel_by_chat_id"
-        assert exc_info.value.details["chat_id"] == "@testchannel"
+@pytest.fixture
+def crud_patches(mocker):
+    """Patch the transaction helper and the lookups used by the write paths.
+
+    mocker.patch returns MagicMocks, so the patched atomic_transaction already
+    works as a context manager whose __exit__ lets exceptions propagate.
+    """
+    return SimpleNamespace(
+        atomic=mocker.patch('crud.telegram.atomic_transaction'),
+        get_by_chat_id=mocker.patch('crud.telegram.get_channel_by_chat_id'),
+        get_by_id=mocker.patch('crud.telegram.get_channel_by_id'),
+        get_post=mocker.patch('crud.telegram.get_post_by_id')
+    )
+
+
+class TestGetChannelById:
+    """Test suite for get_channel_by_id function."""
+
+    @pytest.mark.parametrize(
+        "channel_id, include_deleted, chain, found",
+        [
+            (123, False, ('filter', 'filter', 'first'), True),
+            (999, False, ('filter', 'filter', 'first'), False),
+            # No deleted_at filter
+            (123, True, ('filter', 'first'), True),
+        ],
+        ids=["found", "not_found", "include_deleted"]
+    )
+    def test_get_channel_by_id(self, mock_db, stub_chain, mock_logger, channel_id, include_deleted, chain, found):
+        """Test channel retrieval by ID with and without soft-deleted rows."""
+        expected = SimpleNamespace(name="Test Channel") if found else None
+        stub_chain(*chain, result=expected)
+        
+        result = get_channel_by_id(mock_db, channel_id, include_deleted=include_deleted)
+        
+        assert result is expected
+        assert mock_db.query.call_count == 1
+        assert mock_db.query.call_args.args == (TelegramChannel,)
+        # Should log both search and found/not found messages
+        assert mock_logger.debug.call_count == 2
 
-    def test_get_channel_by_chat_id_logging(self):
-        """Test logging behavior in get_channel_by_chat_id."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.name = "Test Channel"
-        
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_channel
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            result = get_channel_by_chat_id(mock_db, "@testchannel")
-            
-            assert result == mock_channel
-            mock_logger.debug.assert_called()
-            # Should log both search and found messages
-            assert mock_logger.debug.call_count == 2
+
+class TestGetChannelByChatId:
+    """Test suite for get_channel_by_chat_id function."""
+
+    @pytest.mark.parametrize(
+        "chat_id, include_deleted, chain, found",
+        [
+            ("@testchannel", False, ('filter', 'filter', 'first'), True),
+            ("@nonexistent", False, ('filter', 'filter', 'first'), False),
+            # No deleted_at filter
+            ("@testchannel", True, ('filter', 'first'), True),
+        ],
+        ids=["found", "not_found", "include_deleted"]
+    )
+    def test_get_channel_by_chat_id(self, mock_db, stub_chain, mock_logger, chat_id, include_deleted, chain, found):
+        """Test channel retrieval by chat ID with and without soft-deleted rows."""
+        expected = SimpleNamespace(name="Test Channel") if found else None
+        stub_chain(*chain, result=expected)
+        
+        result = get_channel_by_chat_id(mock_db, chat_id, include_deleted=include_deleted)
+        
+        assert result is expected
+        assert mock_db.query.call_count == 1
+        assert mock_db.query.call_args.args == (TelegramChannel,)
+        # Should log both search and found/not found messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestGetChannels:
     """Test suite for get_channels function."""
 
-    def test_get_channels_success(self):
-        """Test successful channels retrieval."""
-        mock_db = Mock(spec=Session)
-        mock_channels = [Mock(spec=TelegramChannel), Mock(spec=TelegramChannel)]
-        
-        # Build the query chain properly
-        mock_query = Mock()
-        mock_filtered_query = Mock()
-        mock_ordered_query = Mock()
-        mock_offset_query = Mock()
-        mock_limit_query = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.filter.return_value = mock_filtered_query
-        mock_filtered_query.order_by.return_value = mock_ordered_query
-        mock_ordered_query.offset.return_value = mock_offset_query
-        mock_offset_query.limit.return_value = mock_limit_query
-        mock_limit_query.all.return_value = mock_channels
-        
-        result = get_channels(mock_db, skip=10, limit=20)
-        
-        assert result == mock_channels
+    @pytest.mark.parametrize(
+        "kwargs, chain",
+        [
+            ({'skip': 10, 'limit': 20}, ('filter', 'order_by', 'offset', 'limit', 'all')),
+            # No deleted_at filter
+            ({'include_deleted': True}, ('order_by', 'offset', 'limit', 'all')),
+            # Extra is_active filter
+            ({'active_only': True}, ('filter', 'filter', 'order_by', 'offset', 'limit', 'all')),
+        ],
+        ids=["default", "include_deleted", "active_only"]
+    )
+    def test_get_channels(self, mock_db, stub_chain, kwargs, chain):
+        """Test channels retrieval for each combination of query flags."""
+        mock_channels = [sentinel.channel1, sentinel.channel2]
+        stub_chain(*chain, result=mock_channels)
+        
+        result = get_channels(mock_db, **kwargs)
+        
+        assert result is mock_channels
         mock_db.query.assert_called_once_with(TelegramChannel)
 
-    def test_get_channels_include_deleted(self):
-        """Test channels retrieval with include_deleted flag."""
-        mock_db = Mock(spec=Session)
-        mock_channels = [Mock(spec=TelegramChannel)]
-        
-        # Build the query chain for include_deleted=True (no filter step)
-        mock_query = Mock()
-        mock_ordered_query = Mock()
-        mock_offset_query = Mock()
-        mock_limit_query = Mock()
-        
-        mock_db.query.return_value = mock_query
-        mock_query.order_by.return_value = mock_ordered_query
-        mock_ordered_query.offset.return_value = mock_offset_query
-        mock_offset_query.limit.return_value = mock_limit_query
-        mock_limit_query.all.return_value = mock_channels
-        
-        result = get_channels(mock_db, include_deleted=True)
-        
-        assert result == mock_channels
-
-    def test_get_channels_active_only(self):
-        """Test channels retrieval with active_only flag."""
-        mock_db = Mock(spec=Session)
-        mock_channels = [Mock(spec=TelegramChannel)]
+    def test_get_channels_logging(self, mock_db, stub_chain, mock_logger):
+        """Test logging behavior in get_channels."""
+        mock_channels = [SimpleNamespace()]
         
-        mock_db.query.return_value.filter.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_channels
+        stub_chain('filter', 'order_by', 'offset', 'limit', 'all', result=mock_channels)
         
-        result = get_channels(mock_db, active_only=True)
+        result = get_channels(mock_db, skip=5, limit=10)
         
         assert result == mock_channels
-
-    def test_get_channels_database_exception(self):
-        """Test channels retrieval with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.side_effect = Exception("Database error")
-        
-        with pytest.raises(DatabaseException) as exc_info:
-            get_channels(mock_db)
-        
-        assert "Failed to retrieve telegram channels list" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_channels"
-
-    def test_get_channels_logging(self):
-        """Test logging behavior in get_channels."""
-        mock_db = Mock(spec=Session)
-        mock_channels = [Mock(spec=TelegramChannel)]
-        
-        mock_db.query.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_channels
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            result = get_channels(mock_db, skip=5, limit=10)
-            
-            assert result == mock_channels
-            mock_logger.debug.assert_called()
-            # Should log both fetch and result messages
-            assert mock_logger.debug.call_count == 2
+        mock_logger.debug.assert_called()
+        # Should log both fetch and result messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestCreateChannel:
     """Test suite for create_channel function."""
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_create_channel_success(self, mock_get_by_chat_id, mock_atomic):
+    def test_create_channel_success(self, mock_db, crud_patches):
         """Test successful channel creation."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
-        mock_channel_data.chat_id = "@testchannel"
-        mock_channel_data.description = "A test channel"
-        mock_channel_data.template_id = None
-        mock_channel_data.is_active = True
-        mock_channel_data.auto_post = False
-        mock_channel_data.send_photos = True
-        mock_channel_data.disable_web_page_preview = False
-        mock_channel_data.disable_notification = False
+        mock_channel_data = _channel_create_data(description="A test channel")
         
         # Mock no existing channel
-        mock_get_by_chat_id.return_value = None
+        crud_patches.get_by_chat_id.return_value = None
         
         # Mock database operations
         mock_db.add.return_value = None
         mock_db.flush.return_value = None
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
         result = create_channel(mock_db, mock_channel_data)
         
         mock_db.add.assert_called_once()
         mock_db.flush.assert_called_once()
-        mock_get_by_chat_id.assert_called_once_with(mock_db, "@testchannel")
+        assert crud_patches.get_by_chat_id.call_count == 1
+        assert crud_patches.get_by_chat_id.call_args.args == (mock_db, "@testchannel")
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_create_channel_duplicate_chat_id(self, mock_get_by_chat_id, mock_atomic):
+    def test_create_channel_duplicate_chat_id(self, mock_db, crud_patches):
         """Test channel creation with duplicate chat ID."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
-        mock_channel_data.chat_id = "@existingchannel"
+        mock_channel_data = _channel_create_data(chat_id="@existingchannel")
         
         # Mock existing channel
-        mock_existing_channel = Mock(spec=TelegramChannel)
-        mock_existing_channel.id = 123
-        mock_get_by_chat_id.return_value = mock_existing_channel
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        mock_existing_channel = SimpleNamespace(id=123)
+        crud_patches.get_by_chat_id.return_value = mock_existing_channel
         
         with pytest.raises(ValidationException) as exc_info:
             create_channel(mock_db, mock_channel_data)
@@ -315,63 +220,46 @@ class TestCreateChannel:
         assert exc_info.value.details["chat_id"] == "@existingchannel"
         assert exc_info.value.details["existing_id"] == 123
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_create_channel_with_template(self, mock_get_by_chat_id, mock_atomic):
+    def test_create_channel_with_template(self, mock_db, stub_chain, crud_patches):
         """Test channel creation with template validation."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
-        mock_channel_data.chat_id = "@testchannel"
-        mock_channel_data.template_id = 456
-        mock_channel_data.description = None
-        mock_channel_data.is_active = True
-        mock_channel_data.auto_post = False
-        mock_channel_data.send_photos = True
-        mock_channel_data.disable_web_page_preview = False
-        mock_channel_data.disable_notification = False
+        mock_channel_data = _channel_create_data(template_id=456)
         
         # Mock no existing channel
-        mock_get_by_chat_id.return_value = None
+        crud_patches.get_by_chat_id.return_value = None
         
         # Mock template exists
-        mock_template = Mock(spec=MessageTemplate)
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_template
+        mock_template = SimpleNamespace(id=456)
+        stub_chain('filter', 'first', result=mock_template)
         
         # Mock database operations
         mock_db.add.return_value = None
         mock_db.flush.return_value = None
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
         result = create_channel(mock_db, mock_channel_data)
         
         mock_db.add.assert_called_once()
 
-    # Note: Template validation test moved to integration tests
-    # Complex SQLAlchemy query mocking is problematic in unit tests
-    # See tests/integration/test_telegram.py for template validation scenarios
+    def test_create_channel_template_not_found(self, mock_db, stub_chain, crud_patches):
+        """Test channel creation with a missing template."""
+        crud_patches.get_by_chat_id.return_value = None
+        stub_chain('filter', 'first', result=None)
+        
+        with pytest.raises(ValidationException) as exc_info:
+            create_channel(mock_db, _channel_create_data(template_id=999))
+        
+        assert "Template not found" in str(exc_info.value)
+        assert exc_info.value.details["template_id"] == 999
+        mock_db.query.assert_called_once_with(MessageTemplate)
+        mock_db.add.assert_not_called()
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_create_channel_integrity_error(self, mock_get_by_chat_id, mock_atomic):
+    def test_create_channel_integrity_error(self, mock_db, crud_patches):
         """Test channel creation with integrity error."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
-        mock_channel_data.chat_id = "@testchannel"
+        mock_channel_data = _channel_create_data()
         
         # Mock no existing channel
-        mock_get_by_chat_id.return_value = None
-        
-        # Mock integrity error
-        integrity_error = IntegrityError("statement", "params", "orig")
-        integrity_error.orig = Mock()
-        integrity_error.orig.__str__ = Mock(return_value="UNIQUE constraint failed: telegram_channels.chat_id")
+        crud_patches.get_by_chat_id.return_value = None
         
-        mock_atomic.return_value.__enter__.side_effect = integrity_error
+        crud_patches.atomic.return_value.__enter__.side_effect = _unique_chat_id_error()
         
         with pytest.raises(ValidationException) as exc_info:
             create_channel(mock_db, mock_channel_data)
@@ -379,18 +267,14 @@ class TestCreateChannel:
         assert "Telegram channel chat_id already exists" in str(exc_info.value)
         assert exc_info.value.details["chat_id"] == "@testchannel"
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_create_channel_database_exception(self, mock_get_by_chat_id, mock_atomic):
+    def test_create_channel_database_exception(self, mock_db, crud_patches):
         """Test channel creation with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
+        mock_channel_data = _channel_create_data()
         
         # Mock no existing channel
-        mock_get_by_chat_id.return_value = None
+        crud_patches.get_by_chat_id.return_value = None
         
-        mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
             create_channel(mock_db, mock_channel_data)
@@ -398,327 +282,228 @@ class TestCreateChannel:
         assert "Failed to create telegram channel" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "create_channel"
 
-    def test_create_channel_logging(self):
+    def test_create_channel_logging(self, mock_db, mock_logger, crud_patches):
         """Test logging behavior in create_channel."""
-        mock_db = Mock(spec=Session)
-        mock_channel_data = Mock(spec=TelegramChannelCreate)
-        mock_channel_data.name = "Test Channel"
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            with patch('crud.telegram.get_channel_by_chat_id', return_value=None):
-                with patch('crud.telegram.atomic_transaction') as mock_atomic:
-                    mock_atomic.return_value.__enter__.side_effect = Exception("Test error")
-                    
-                    with pytest.raises(DatabaseException):
-                        create_channel(mock_db, mock_channel_data)
-                    
-                    mock_logger.info.assert_called()
-                    assert "Creating telegram channel" in str(mock_logger.info.call_args)
+        mock_channel_data = _channel_create_data()
+        crud_patches.get_by_chat_id.return_value = None
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Test error")
+        
+        with pytest.raises(DatabaseException):
+            create_channel(mock_db, mock_channel_data)
+        
+        mock_logger.info.assert_called()
+        assert "Creating telegram channel" in mock_logger.info.call_args.args[0]
 
 
 class TestUpdateChannel:
     """Test suite for update_channel function."""
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_update_channel_success(self, mock_get_by_id, mock_atomic):
+    def test_update_channel_success(self, mock_db, crud_patches, frozen_now):
         """Test successful channel update."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.chat_id = "@testchannel"
+        mock_channel = SimpleNamespace(chat_id="@testchannel")
         
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
-        mock_channel_update.model_dump.return_value = {"name": "Updated Channel", "is_active": False}
+        channel_update = TelegramChannelUpdate(name="Updated Channel", is_active=False)
         
-        mock_get_by_id.return_value = mock_channel
+        crud_patches.get_by_id.return_value = mock_channel
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
-        result = update_channel(mock_db, 123, mock_channel_update)
+        result = update_channel(mock_db, 123, channel_update)
         
         assert result == mock_channel
         mock_db.flush.assert_called_once()
-        assert mock_channel.updated_at is not None
+        assert mock_channel.updated_at == frozen_now
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_update_channel_not_found(self, mock_get_by_id, mock_atomic):
+    def test_update_channel_not_found(self, mock_db, crud_patches):
         """Test channel update when channel not found."""
-        mock_db = Mock(spec=Session)
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
-        
-        mock_get_by_id.return_value = None
+        channel_update = TelegramChannelUpdate()
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_by_id.return_value = None
         
         with pytest.raises(ValidationException) as exc_info:
-            update_channel(mock_db, 999, mock_channel_update)
+            update_channel(mock_db, 999, channel_update)
         
         assert "Telegram channel not found for update" in str(exc_info.value)
         assert exc_info.value.details["channel_id"] == 999
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    @patch('crud.telegram.get_channel_by_chat_id')
-    def test_update_channel_duplicate_chat_id(self, mock_get_by_chat_id, mock_get_by_id, mock_atomic):
+    def test_update_channel_duplicate_chat_id(self, mock_db, crud_patches):
         """Test channel update with duplicate chat ID."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_channel.chat_id = "@oldchannel"
+        mock_channel = SimpleNamespace(chat_id="@oldchannel")
         
-        mock_existing_channel = Mock(spec=TelegramChannel)
-        mock_existing_channel.id = 456
+        mock_existing_channel = SimpleNamespace(id=456)
         
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
-        mock_channel_update.model_dump.return_value = {"chat_id": "@existingchannel"}
+        channel_update = TelegramChannelUpdate(chat_id="@existingchannel")
         
-        mock_get_by_id.return_value = mock_channel
-        mock_get_by_chat_id.return_value = mock_existing_channel
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_by_id.return_value = mock_channel
+        crud_patches.get_by_chat_id.return_value = mock_existing_channel
         
         with pytest.raises(ValidationException) as exc_info:
-            update_channel(mock_db, 123, mock_channel_update)
+            update_channel(mock_db, 123, channel_update)
         
         assert "Telegram channel chat_id already exists" in str(exc_info.value)
         assert exc_info.value.details["chat_id"] == "@existingchannel"
         assert exc_info.value.details["existing_id"] == 456
 
-    # Note: Template validation test moved to integration tests
-    # Complex SQLAlchemy query mocking is problematic in unit tests
-    # See tests/integration/test_telegram.py for template validation scenarios
-
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_update_channel_integrity_error(self, mock_get_by_id, mock_atomic):
-        """Test channel update with integrity error."""
-        mock_db = Mock(spec=Session)
-        mock_channel = Mock(spec=TelegramChannel)
+    def test_update_channel_template_not_found(self, mock_db, stub_chain, crud_patches):
+        """Test channel update with a missing template."""
+        crud_patches.get_by_id.return_value = SimpleNamespace(chat_id="@testchannel")
+        channel_update = TelegramChannelUpdate(template_id=999)
+        stub_chain('filter', 'first', result=None)
         
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
-        mock_channel_update.model_dump.return_value = {"name": "Updated"}
+        with pytest.raises(ValidationException) as exc_info:
+            update_channel(mock_db, 123, channel_update)
         
-        mock_get_by_id.return_value = mock_channel
+        assert "Template not found" in str(exc_info.value)
+        assert exc_info.value.details["template_id"] == 999
+        mock_db.flush.assert_not_called()
+
+    def test_update_channel_integrity_error(self, mock_db, crud_patches):
+        """Test channel update with integrity error."""
+        channel_update = TelegramChannelUpdate(name="Updated")
         
-        # Mock integrity error
-        integrity_error = IntegrityError("statement", "params", "orig")
-        integrity_error.orig = Mock()
-        integrity_error.orig.__str__ = Mock(return_value="UNIQUE constraint failed: telegram_channels.chat_id")
+        crud_patches.get_by_id.return_value = sentinel.channel
         
-        mock_atomic.return_value.__enter__.side_effect = integrity_error
+        crud_patches.atomic.return_value.__enter__.side_effect = _unique_chat_id_error()
         
         with pytest.raises(ValidationException) as exc_info:
-            update_channel(mock_db, 123, mock_channel_update)
+            update_channel(mock_db, 123, channel_update)
         
         assert "Telegram channel chat_id already exists" in str(exc_info.value)
         assert exc_info.value.details["channel_id"] == 123
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_update_channel_database_exception(self, mock_get_by_id, mock_atomic):
+    def test_update_channel_database_exception(self, mock_db, crud_patches):
         """Test channel update with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
+        channel_update = TelegramChannelUpdate()
         
-        mock_get_by_id.return_value = Mock(spec=TelegramChannel)
+        crud_patches.get_by_id.return_value = sentinel.channel
         
-        mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
-            update_channel(mock_db, 123, mock_channel_update)
+            update_channel(mock_db, 123, channel_update)
         
         assert "Failed to update telegram channel" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "update_channel"
         assert exc_info.value.details["channel_id"] == 123
 
-    def test_update_channel_logging(self):
+    def test_update_channel_logging(self, mock_db, mock_logger, crud_patches):
         """Test logging behavior in update_channel."""
-        mock_db = Mock(spec=Session)
-        mock_channel_update = Mock(spec=TelegramChannelUpdate)
+        channel_update = TelegramChannelUpdate()
+        crud_patches.get_by_id.return_value = sentinel.channel
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Test error")
+        
+        with pytest.raises(DatabaseException):
+            update_channel(mock_db, 123, channel_update)
         
-        with patch('crud.telegram.logger') as mock_logger:
-            with patch('crud.telegram.get_channel_by_id', return_value=Mock(spec=TelegramChannel)):
-                with patch('crud.telegram.atomic_transaction') as mock_atomic:
-                    mock_atomic.return_value.__enter__.side_effect = Exception("Test error")
-                    
-                    with pytest.raises(DatabaseException):
-                        update_channel(mock_db, 123, mock_channel_update)
-                    
-                    mock_logger.info.assert_called()
-                    assert "Updating telegram channel" in str(mock_logger.info.call_args)
+        mock_logger.info.assert_called()
+        assert "Updating telegram channel" in mock_logger.info.call_args.args[0]
 
 
 class TestGetPostById:
     """Test suite for get_post_by_id function."""
 
-    def test_get_post_by_id_found(self):
-        """Test successful post retrieval by ID."""
-        mock_db = Mock(spec=Session)
-        mock_post = Mock(spec=TelegramPost)
-        mock_post.product_id = 123
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_post
-        
-        result = get_post_by_id(mock_db, 456)
-        
-        assert result == mock_post
-        mock_db.query.assert_called_once_with(TelegramPost)
-
-    def test_get_post_by_id_not_found(self):
-        """Test post retrieval when ID not found."""
-        mock_db = Mock(spec=Session)
-        
-        mock_db.query.return_value.filter.return_value.first.return_value = None
-        
-        result = get_post_by_id(mock_db, 999)
-        
-        assert result is None
-
-    def test_get_post_by_id_database_exception(self):
-        """Test post retrieval with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.side_effect = Exception("Database error")
-        
-        with pytest.raises(DatabaseException) as exc_info:
-            get_post_by_id(mock_db, 123)
-        
-        assert "Failed to retrieve telegram post by ID" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_post_by_id"
-        assert exc_info.value.details["post_id"] == 123
-
-    def test_get_post_by_id_logging(self):
-        """Test logging behavior in get_post_by_id."""
-        mock_db = Mock(spec=Session)
-        mock_post = Mock(spec=TelegramPost)
-        mock_post.product_id = 123
+    @pytest.mark.parametrize(
+        "post_id, found",
+        [(456, True), (999, False)],
+        ids=["found", "not_found"]
+    )
+    def test_get_post_by_id(self, mock_db, stub_chain, mock_logger, post_id, found):
+        """Test post retrieval by ID."""
+        expected = SimpleNamespace(product_id=123) if found else None
+        stub_chain('filter', 'first', result=expected)
         
-        mock_db.query.return_value.filter.return_value.first.return_value = mock_post
+        result = get_post_by_id(mock_db, post_id)
         
-        with patch('crud.telegram.logger') as mock_logger:
-            result = get_post_by_id(mock_db, 456)
-            
-            assert result == mock_post
-            mock_logger.debug.assert_called()
-            # Should log both search and found messages
-            assert mock_logger.debug.call_count == 2
+        assert result is expected
+        assert mock_db.query.call_count == 1
+        assert mock_db.query.call_args.args == (TelegramPost,)
+        # Should log both search and found/not found messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestGetPosts:
     """Test suite for get_posts function."""
 
-    def test_get_posts_success(self):
+    def test_get_posts_success(self, mock_db, stub_chain):
         """Test successful posts retrieval."""
-        mock_db = Mock(spec=Session)
-        mock_posts = [Mock(spec=TelegramPost), Mock(spec=TelegramPost)]
+        mock_posts = [SimpleNamespace(), SimpleNamespace()]
         
-        mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_posts
+        stub_chain('order_by', 'offset', 'limit', 'all', result=mock_posts)
         
         result = get_posts(mock_db, skip=10, limit=20)
         
         assert result == mock_posts
         mock_db.query.assert_called_once_with(TelegramPost)
 
-    def test_get_posts_with_filters(self):
+    def test_get_posts_with_filters(self, mock_db, stub_chain):
         """Test posts retrieval with filtering options."""
-        mock_db = Mock(spec=Session)
-        mock_posts = [Mock(spec=TelegramPost)]
+        mock_posts = [SimpleNamespace()]
         
-        mock_db.query.return_value.filter.return_value.filter.return_value.filter.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_posts
+        stub_chain('filter', 'filter', 'filter', 'order_by', 'offset', 'limit', 'all', result=mock_posts)
         
         result = get_posts(mock_db, status=PostStatus.SENT, channel_id=123, product_id=456)
         
         assert result == mock_posts
 
-    def test_get_posts_database_exception(self):
-        """Test posts retrieval with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_db.query.side_effect = Exception("Database error")
-        
-        with pytest.raises(DatabaseException) as exc_info:
-            get_posts(mock_db)
-        
-        assert "Failed to retrieve telegram posts list" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_posts"
-
-    def test_get_posts_logging(self):
+    def test_get_posts_logging(self, mock_db, stub_chain, mock_logger):
         """Test logging behavior in get_posts."""
-        mock_db = Mock(spec=Session)
-        mock_posts = [Mock(spec=TelegramPost)]
+        mock_posts = [SimpleNamespace()]
+        
+        stub_chain('order_by', 'offset', 'limit', 'all', result=mock_posts)
         
-        mock_db.query.return_value.order_by.return_value.offset.return_value.limit.return_value.all.return_value = mock_posts
+        result = get_posts(mock_db, skip=5, limit=10)
         
-        with patch('crud.telegram.logger') as mock_logger:
-            result = get_posts(mock_db, skip=5, limit=10)
-            
-            assert result == mock_posts
-            mock_logger.debug.assert_called()
-            # Should log both fetch and result messages
-            assert mock_logger.debug.call_count == 2
+        assert result == mock_posts
+        mock_logger.debug.assert_called()
+        # Should log both fetch and result messages
+        assert mock_logger.debug.call_count == 2
 
 
 class TestCreatePost:
     """Test suite for create_post function."""
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_create_post_success(self, mock_get_channel, mock_atomic):
+    def test_create_post_success(self, mock_db, stub_chain, crud_patches):
         """Test successful post creation."""
-        mock_db = Mock(spec=Session)
-        mock_post_data = Mock(spec=TelegramPostCreate)
-        mock_post_data.product_id = 123
-        mock_post_data.channel_id = 456
-        mock_post_data.template_id = None
+        mock_post_data = SimpleNamespace(product_id=123, channel_id=456, template_id=None)
         
         # Mock product exists
-        mock_product = Mock(spec=Product)
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_product
+        mock_product = SimpleNamespace(id=123)
+        stub_chain('filter', 'first', result=mock_product)
         
         # Mock channel exists
-        mock_channel = Mock(spec=TelegramChannel)
-        mock_get_channel.return_value = mock_channel
+        mock_channel = SimpleNamespace(id=456)
+        crud_patches.get_by_id.return_value = mock_channel
         
         # Mock database operations
         mock_db.add.return_value = None
         mock_db.flush.return_value = None
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
-        
         result = create_post(mock_db, mock_post_data, "Rendered content")
         
         mock_db.add.assert_called_once()
         mock_db.flush.assert_called_once()
 
-    # Note: Product validation test moved to integration tests
-    # Complex SQLAlchemy query mocking is problematic in unit tests
-    # See tests/integration/test_telegram.py for product validation scenarios
+    def test_create_post_product_not_found(self, mock_db, stub_chain, crud_patches):
+        """Test post creation when product not found."""
+        stub_chain('filter', 'first', result=None)
+        post_data = SimpleNamespace(product_id=999, channel_id=456, template_id=None)
+        
+        with pytest.raises(ValidationException) as exc_info:
+            create_post(mock_db, post_data, "Content")
+        
+        assert "Product not found" in str(exc_info.value)
+        assert exc_info.value.details["product_id"] == 999
+        mock_db.query.assert_called_once_with(Product)
+        crud_patches.get_by_id.assert_not_called()
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_channel_by_id')
-    def test_create_post_channel_not_found(self, mock_get_channel, mock_atomic):
+    def test_create_post_channel_not_found(self, mock_db, stub_chain, crud_patches):
         """Test post creation when channel not found."""
-        mock_db = Mock(spec=Session)
-        mock_post_data = Mock(spec=TelegramPostCreate)
-        mock_post_data.product_id = 123
-        mock_post_data.channel_id = 999
+        mock_post_data = SimpleNamespace(product_id=123, channel_id=999, template_id=None)
         
         # Mock product exists
-        mock_product = Mock(spec=Product)
-        mock_db.query.return_value.filter.return_value.filter.return_value.first.return_value = mock_product
+        mock_product = SimpleNamespace(id=123)
+        stub_chain('filter', 'first', result=mock_product)
         
         # Mock channel not found
-        mock_get_channel.return_value = None
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_by_id.return_value = None
         
         with pytest.raises(ValidationException) as exc_info:
             create_post(mock_db, mock_post_data, "Content")
@@ -726,19 +511,27 @@ class TestCreatePost:
         assert "Telegram channel not found" in str(exc_info.value)
         assert exc_info.value.details["channel_id"] == 999
 
-    # Note: Template validation test moved to integration tests
-    # Complex SQLAlchemy query mocking is problematic in unit tests
-    # See tests/integration/test_telegram.py for template validation scenarios
+    def test_create_post_template_not_found(self, mock_db, crud_patches):
+        """Test post creation with a missing template."""
+        product_query, template_query = Mock(), Mock()
+        product_query.filter.return_value.first.return_value = SimpleNamespace(id=123)
+        template_query.filter.return_value.first.return_value = None
+        mock_db.query.side_effect = {Product: product_query, MessageTemplate: template_query}.__getitem__
+        crud_patches.get_by_id.return_value = SimpleNamespace(id=456)
+        post_data = SimpleNamespace(product_id=123, channel_id=456, template_id=999)
+        
+        with pytest.raises(ValidationException) as exc_info:
+            create_post(mock_db, post_data, "Content")
+        
+        assert "Template not found" in str(exc_info.value)
+        assert exc_info.value.details["template_id"] == 999
+        mock_db.add.assert_not_called()
 
-    @patch('crud.telegram.atomic_transaction')
-    def test_create_post_database_exception(self, mock_atomic):
+    def test_create_post_database_exception(self, mock_db, crud_patches):
         """Test post creation with database exception."""
-        mock_db = Mock(spec=Session)
-        mock_post_data = Mock(spec=TelegramPostCreate)
-        mock_post_data.product_id = 123
-        mock_post_data.channel_id = 456
+        mock_post_data = SimpleNamespace(product_id=123, channel_id=456, template_id=None)
         
-        mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
             create_post(mock_db, mock_post_data, "Content")
@@ -746,64 +539,41 @@ class TestCreatePost:
         assert "Failed to create telegram post" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "create_post"
 
-    def test_create_post_logging(self):
+    def test_create_post_logging(self, mock_db, mock_logger, crud_patches):
         """Test logging behavior in create_post."""
-        mock_db = Mock(spec=Session)
-        mock_post_data = Mock(spec=TelegramPostCreate)
-        mock_post_data.product_id = 123
-        mock_post_data.channel_id = 456
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            with patch('crud.telegram.atomic_transaction') as mock_atomic:
-                mock_atomic.return_value.__enter__.side_effect = Exception("Test error")
-                
-                with pytest.raises(DatabaseException):
-                    create_post(mock_db, mock_post_data, "Content")
-                
-                mock_logger.info.assert_called()
-                assert "Creating telegram post" in str(mock_logger.info.call_args)
+        mock_post_data = SimpleNamespace(product_id=123, channel_id=456, template_id=None)
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Test error")
+        
+        with pytest.raises(DatabaseException):
+            create_post(mock_db, mock_post_data, "Content")
+        
+        mock_logger.info.assert_called()
+        assert "Creating telegram post" in mock_logger.info.call_args.args[0]
 
 
 class TestUpdatePostStatus:
     """Test suite for update_post_status function."""
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_post_by_id')
-    def test_update_post_status_to_sent(self, mock_get_post, mock_atomic):
+    def test_update_post_status_to_sent(self, mock_db, crud_patches, frozen_now):
         """Test updating post status to SENT."""
-        mock_db = Mock(spec=Session)
-        mock_post = Mock(spec=TelegramPost)
-        mock_post.status = PostStatus.PENDING.value
-        
-        mock_get_post.return_value = mock_post
+        mock_post = SimpleNamespace(status=PostStatus.PENDING.value)
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_post.return_value = mock_post
         
         result = update_post_status(mock_db, 123, PostStatus.SENT, message_id=456)
         
         assert result == mock_post
         assert mock_post.status == PostStatus.SENT.value
         assert mock_post.message_id == 456
-        assert mock_post.sent_at is not None
+        assert mock_post.sent_at == frozen_now
         assert mock_post.error_message is None
         mock_db.flush.assert_called_once()
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_post_by_id')
-    def test_update_post_status_to_failed(self, mock_get_post, mock_atomic):
+    def test_update_post_status_to_failed(self, mock_db, crud_patches):
         """Test updating post status to FAILED."""
-        mock_db = Mock(spec=Session)
-        mock_post = Mock(spec=TelegramPost)
-        mock_post.status = PostStatus.PENDING.value
-        mock_post.retry_count = 0
-        
-        mock_get_post.return_value = mock_post
+        mock_post = SimpleNamespace(status=PostStatus.PENDING.value, retry_count=0)
         
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_post.return_value = mock_post
         
         result = update_post_status(mock_db, 123, PostStatus.FAILED, error_message="Send failed")
         
@@ -813,17 +583,9 @@ class TestUpdatePostStatus:
         assert mock_post.error_message == "Send failed"
         mock_db.flush.assert_called_once()
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_post_by_id')
-    def test_update_post_status_not_found(self, mock_get_post, mock_atomic):
+    def test_update_post_status_not_found(self, mock_db, crud_patches):
         """Test updating post status when post not found."""
-        mock_db = Mock(spec=Session)
-        
-        mock_get_post.return_value = None
-        
-        # Mock atomic transaction
-        mock_atomic.return_value.__enter__ = Mock()
-        mock_atomic.return_value.__exit__ = Mock(return_value=None)
+        crud_patches.get_post.return_value = None
         
         with pytest.raises(ValidationException) as exc_info:
             update_post_status(mock_db, 999, PostStatus.SENT)
@@ -831,15 +593,11 @@ class TestUpdatePostStatus:
         assert "Telegram post not found for status update" in str(exc_info.value)
         assert exc_info.value.details["post_id"] == 999
 
-    @patch('crud.telegram.atomic_transaction')
-    @patch('crud.telegram.get_post_by_id')
-    def test_update_post_status_database_exception(self, mock_get_post, mock_atomic):
+    def test_update_post_status_database_exception(self, mock_db, crud_patches):
         """Test updating post status with database exception."""
-        mock_db = Mock(spec=Session)
+        crud_patches.get_post.return_value = sentinel.post
         
-        mock_get_post.return_value = Mock(spec=TelegramPost)
-        
-        mock_atomic.return_value.__enter__.side_effect = Exception("Database error")
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
             update_post_status(mock_db, 123, PostStatus.SENT)
@@ -847,31 +605,25 @@ class TestUpdatePostStatus:
         assert "Failed to update telegram post status" in str(exc_info.value)
         assert exc_info.value.details["operation"] == "update_post_status"
 
-    def test_update_post_status_logging(self):
+    def test_update_post_status_logging(self, mock_db, mock_logger, crud_patches):
         """Test logging behavior in update_post_status."""
-        mock_db = Mock(spec=Session)
+        crud_patches.get_post.return_value = sentinel.post
+        crud_patches.atomic.return_value.__enter__.side_effect = Exception("Test error")
+        
+        with pytest.raises(DatabaseException):
+            update_post_status(mock_db, 123, PostStatus.SENT)
         
-        with patch('crud.telegram.logger') as mock_logger:
-            with patch('crud.telegram.get_post_by_id', return_value=Mock(spec=TelegramPost)):
-                with patch('crud.telegram.atomic_transaction') as mock_atomic:
-                    mock_atomic.return_value.__enter__.side_effect = Exception("Test error")
-                    
-                    with pytest.raises(DatabaseException):
-                        update_post_status(mock_db, 123, PostStatus.SENT)
-                    
-                    mock_logger.info.assert_called()
-                    assert "Updating telegram post 123 status to sent" in str(mock_logger.info.call_args)
+        mock_logger.info.assert_called()
+        assert "Updating telegram post 123 status to sent" in mock_logger.info.call_args.args[0]
 
 
 class TestGetTelegramStats:
     """Test suite for get_telegram_stats function."""
 
-    def test_get_telegram_stats_success(self):
+    def test_get_telegram_stats_success(self, mock_db, stub_chain):
         """Test successful telegram statistics retrieval."""
-        mock_db = Mock(spec=Session)
-        
         # Mock channel stats
-        mock_db.query.return_value.filter.return_value.count.return_value = 5  # total channels
+        stub_chain('filter', 'count', result=5)  # total channels
         
         # Mock active channels query  
         mock_active_query = Mock()
@@ -903,8 +655,7 @@ class TestGetTelegramStats:
         mock_db.query.side_effect = query_side_effect
         
         # Mock last post query
-        mock_last_post = Mock(spec=TelegramPost)
-        mock_last_post.sent_at = datetime(2023, 6, 15, 12, 0, 0, tzinfo=timezone.utc)
+        mock_last_post = SimpleNamespace(sent_at=datetime(2023, 6, 15, 12, 0, 0, tzinfo=timezone.utc))
         mock_post_query.filter.return_value.order_by.return_value.first.return_value = mock_last_post
         
         result = get_telegram_stats(mock_db)
@@ -921,41 +672,58 @@ class TestGetTelegramStats:
         
         assert result == expected_stats
 
-    def test_get_telegram_stats_no_last_post(self):
+    def test_get_telegram_stats_no_last_post(self, mock_db, stub_chain):
         """Test telegram statistics when no posts have been sent."""
-        mock_db = Mock(spec=Session)
-        
         # Mock basic stats
-        mock_db.query.return_value.filter.return_value.count.return_value = 0
-        mock_db.query.return_value.count.return_value = 0
+        stub_chain('filter', 'count', result=0)
+        stub_chain('count', result=0)
         
         # Mock no last post
-        mock_db.query.return_value.filter.return_value.order_by.return_value.first.return_value = None
+        stub_chain('filter', 'order_by', 'first', result=None)
         
         result = get_telegram_stats(mock_db)
         
         assert result["last_post_at"] is None
 
-    def test_get_telegram_stats_database_exception(self):
-        """Test telegram statistics with database exception."""
-        mock_db = Mock(spec=Session)
+    def test_get_telegram_stats_logging(self, mock_db, mock_logger):
+        """Test logging behavior in get_telegram_stats."""
+        mock_db.query.side_effect = Exception("Test error")
+        
+        with pytest.raises(DatabaseException):
+            get_telegram_stats(mock_db)
+        
+        mock_logger.error.assert_called()
+        assert "Error getting telegram stats" in mock_logger.error.call_args.args[0]
+
+
+class TestQueryDatabaseException:
+    """Test suite for the read functions wrapping query errors."""
+
+    @pytest.mark.parametrize(
+        "fn, args, message, expected_details",
+        [
+            (get_channel_by_id, (123,), "Failed to retrieve telegram channel by ID",
+             {"operation": "get_channel_by_id", "channel_id": 123}),
+            (get_channel_by_chat_id, ("@testchannel",), "Failed to retrieve telegram channel by chat_id",
+             {"operation": "get_channel_by_chat_id", "chat_id": "@testchannel"}),
+            (get_channels, (), "Failed to retrieve telegram channels list",
+             {"operation": "get_channels"}),
+            (get_post_by_id, (123,), "Failed to retrieve telegram post by ID",
+             {"operation": "get_post_by_id", "post_id": 123}),
+            (get_posts, (), "Failed to retrieve telegram posts list",
+             {"operation": "get_posts"}),
+            (get_telegram_stats, (), "Failed to get telegram statistics",
+             {"operation": "get_telegram_stats"}),
+        ],
+        ids=["get_channel_by_id", "get_channel_by_chat_id", "get_channels",
+             "get_post_by_id", "get_posts", "get_telegram_stats"]
+    )
+    def test_database_exception(self, mock_db, fn, args, message, expected_details):
+        """Test that a failing query is re-raised as DatabaseException."""
         mock_db.query.side_effect = Exception("Database error")
         
         with pytest.raises(DatabaseException) as exc_info:
-            get_telegram_stats(mock_db)
+            fn(mock_db, *args)
         
-        assert "Failed to get telegram statistics" in str(exc_info.value)
-        assert exc_info.value.details["operation"] == "get_telegram_stats"
-
-    def test_get_telegram_stats_logging(self):
-        """Test logging behavior in get_telegram_stats."""
-        mock_db = Mock(spec=Session)
-        
-        with patch('crud.telegram.logger') as mock_logger:
-            mock_db.query.side_effect = Exception("Test error")
-            
-            with pytest.raises(DatabaseException):
-                get_telegram_stats(mock_db)
-            
-            mock_logger.error.assert_called()
-            assert "Error getting telegram stats" in str(mock_logger.error.call_args)
\ No newline at end of file
+        assert message in str(exc_info.value)
+        assert expected_details.items() <= exc_info.value.details.items()